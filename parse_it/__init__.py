@@ -1 +1,20 @@
 from .parser import *
+import importlib
+
+
+# the classes which are only imported when first used as their modules import asyncio / threading & ctypes
+LAZY_CLASSES_MODULES = {
+    "AsyncParseIt": "parse_it.async_parser",
+    "ConfigWatcher": "parse_it.watcher.watcher"
+}
+
+
+def __getattr__(name: str):
+    """lazily returns the parse_*_file functions of each file type, AsyncParseIt & ConfigWatcher, their modules are only
+    imported when first used"""
+    if name in LAZY_CLASSES_MODULES:
+        return getattr(importlib.import_module(LAZY_CLASSES_MODULES[name]), name)
+    file_type = file_type_of_parser_function(name)
+    if file_type is None:
+        raise AttributeError("module " + __name__ + " has no attribute " + name)
+    return load_file_parser(file_type)
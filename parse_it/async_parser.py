@@ -0,0 +1,158 @@
+from parse_it.parser import *
+from typing import Any, Tuple, Optional, Union
+import concurrent.futures
+import functools
+import asyncio
+
+
+class AsyncParseIt(ParseIt):
+
+    def __init__(self, *args, executor: Optional[concurrent.futures.Executor] = None, **kwargs):
+        """configures the object which is used to query all types of configuration inputs available and prioritize them
+                based on your needs without blocking the event loop, reading & parsing the config files is offloaded to
+                an executor with each file parsed concurrently, all the arguments of ParseIt are accepted & work the
+                same way
+
+                    Arguments:
+                        executor -- the executor the reading & parsing of the config files is offloaded to, if None
+                            (default) the default executor of the running event loop is used
+        """
+        super().__init__(*args, **kwargs)
+        self.executor = executor
+
+    async def read_configuration_variable(self, config_name: str, default_value: Any = None, required: bool = False,
+                                          allowed_types: Optional[list] = None) -> Any:
+        """reads a single key of the configuration and returns the first value of it found based on the priority of each
+                config file option given in the __init__ of the class, see ParseIt.read_configuration_variable
+
+                    Arguments:
+                        config_name -- the configuration key name you want to get the value of
+                        default_value -- defaults to None, see config_type_priority in class init for it's use
+                        required -- defaults to False, if set to True will ignore default_value & global_default_value
+                            and will raise an ValueError if the configuration is not configured in any of the config
+                            files/envvars/cli args
+                        allowed_types -- Defaults to None, an optional list of types that are accepted for the variable
+                            to be, if set a check will be preformed and if the variables value given is not of any of
+                            the types in said list a TypeError will be raised
+                    Returns:
+                        config_value -- the value of the configuration requested
+        """
+        return await self._run_lookup(self._read_configuration_variable, config_name, default_value, required,
+                                      allowed_types)
+
+    async def read_multiple_configuration_variables(self, config_names: Union[list, dict], default_value: Any = None,
+                                                    required: bool = False,
+                                                    allowed_types: Optional[list] = None) -> dict:
+        """reads multiple keys of the configuration and returns the first value of each it found based on the priority
+                of each config file option given in the __init__ of the class, see
+                ParseIt.read_multiple_configuration_variables
+
+                    Arguments:
+                        config_names -- a list of the configuration key names you want to get the value of, or a dict of
+                            said names with a dict of the options of each of them, see
+                            ParseIt.read_multiple_configuration_variables
+                        default_value -- defaults to None, see config_type_priority in class init for it's use
+                        required -- defaults to False, if set to True will ignore default_value & global_default_value
+                            and will raise an ValueError if the configuration is not configured in any of the config
+                            files/envvars/cli args
+                        allowed_types -- Defaults to None, an optional list of types that are accepted for the variable
+                            to be, if set a check will be preformed and if the variables value given is not of any of
+                            the types in said list a TypeError will be raised
+                    Returns:
+                        config_value_dict -- a dict of the key/value pairs of all the configurations requested
+        """
+        return await self._run_lookup(self._read_multiple_configuration_variables, config_names, default_value,
+                                      required, allowed_types)
+
+    async def read_all_configuration_variables(self, default_value: Optional[dict] = None,
+                                               required: Optional[list] = None,
+                                               allowed_types: Optional[dict] = None, early_exit: bool = False) -> dict:
+        """reads all configuration variables from all allowed sources and returns a dict that includes the combined
+                result of all of them, see ParseIt.read_all_configuration_variables
+
+                    Arguments:
+                        default_value -- defaults to None, a dict of key/value pairs of a configuration variables & it's
+                            value should it not be defined in any of the valid sources
+                        required -- defaults to None, if given a list configuration variables it will raise a ValueError
+                            if any of the configuration variables is not configured in any of the config
+                            files/envvars/cli args
+                        allowed_types -- Defaults to None, an optional dict of types that are accepted for a variable to
+                            be, if set a check will be preformed and if the variables value given is not of any of the
+                            types in said list a TypeError will be raised
+                        early_exit -- defaults to False, if set to True only the declared keys are read & the lower
+                            priority config files are skipped once all of them are found, see
+                            ParseIt.read_all_configuration_variables
+                    Returns:
+                        config_value_dict -- a dict of the key/value pairs of all the configurations requested
+        """
+        # the config files are parsed one at a time until all the declared keys are found so the whole walk is done in
+        # the executor
+        if early_exit is True:
+            return await self._run_in_executor(self._read_declared_configuration_variables, default_value, required,
+                                               allowed_types)
+        prefetched_files = await self._async_prefetch_config_files()
+        # the merge & type estimation of all the keys is also done in the executor as it can take a while
+        return await self._run_in_executor(self._read_all_configuration_variables, default_value, required,
+                                           allowed_types, prefetched_files)
+
+    async def read_configuration_variable_source(self, config_name: str) -> Tuple[Optional[str], Optional[str]]:
+        """returns where the value of a configuration key is taken from, see ParseIt.read_configuration_variable_source
+
+                    Arguments:
+                        config_name -- the configuration key name you want to find the source of
+                    Returns:
+                        config_type -- the type of the source the value is taken from, None if the configuration key is
+                            not found in any of them
+                        config_file -- the location of the config file the value is taken from, None if the value is
+                            not taken from a file
+        """
+        return await self._run_lookup(self._read_configuration_variable_source, config_name)
+
+    async def rebuild_index(self):
+        """builds the merged config index of all the configuration sources, see ParseIt.rebuild_index
+        """
+        prefetched_files = await self._async_prefetch_config_files()
+        await self._run_in_executor(self._rebuild_index, prefetched_files, True)
+
+    async def _async_prefetch_config_files(self) -> dict:
+        """internal function which parses all the config files that aren't in the parsed files cache (or changed since
+                they were cached) concurrently in the executor
+
+            Returns:
+                prefetched_files -- see ParseIt._prefetch_config_files
+        """
+        file_fingerprints = {}
+        files_to_parse = await self._run_in_executor(self._config_files_to_parse, file_fingerprints)
+        file_dicts = await asyncio.gather(*[
+            self._run_in_executor(load_file_parser(file_type, self.declared_keys), config_file_location)
+            for _, file_type, config_file_location in files_to_parse.values()
+        ])
+        # storing them in the parsed files cache takes the index lock so it's done in the executor as well
+        return await self._run_in_executor(self._cache_parsed_files, files_to_parse, file_dicts, file_fingerprints)
+
+    async def _run_lookup(self, function, *args) -> Any:
+        """internal function which runs a lookup of the index in the executor, the config files that changed since they
+                were parsed are parsed concurrently first & the lookup (which builds or refreshes the index with the
+                files checked ahead of it) takes the index lock so it's never run on the event loop where it could
+                block it while another thread holds said lock
+
+            Arguments:
+                function -- the internal ParseIt function which does the lookup, the prefetched files are passed to it
+                    as it's last argument
+                args -- the rest of the arguments to pass to the function
+            Returns:
+                the return value of the function
+        """
+        prefetched_files = await self._async_prefetch_config_files()
+        return await self._run_in_executor(function, *args, prefetched_files)
+
+    def _run_in_executor(self, function, *args) -> asyncio.Future:
+        """internal function which runs a function in the executor of the object
+
+            Arguments:
+                function -- the function to run
+                args -- the arguments to pass to the function
+            Returns:
+                future -- an awaitable future of the function return value
+        """
+        return asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(function, *args))
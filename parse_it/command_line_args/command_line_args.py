@@ -1,21 +1,24 @@
 import sys
-from typing import Optional
+from typing import Optional, Union
 
 
-def read_command_line_arg(argument: str) -> Optional[str]:
+# the cli args are only parsed once for each sys.argv list, this holds the last parsed list, it's length & the dict of
+# the arguments parsed from it
+parsed_cli_args = (None, None, {})
+
+
+def read_command_line_arg(argument: str) -> Optional[Union[str, bool, list]]:
     """Read an command line argument.
 
             Arguments:
                 argument -- name of the cli argument to get the value of, will auto append "--" to it
             Returns:
-                the value of the argument, None if doesn't exist
+                the value of the argument, True if the argument is given without a value, a list of all the values if
+                the argument is given multiple times, None if doesn't exist
     """
-    if command_line_arg_defined(argument) is True:
-        arg_list = sys.argv
-        key_index = arg_list.index("--" + argument) + 1
-        reply = arg_list[key_index]
-    else:
-        reply = None
+    reply = cli_args_dict().get(argument)
+    if isinstance(reply, list):
+        reply = list(reply)
     return reply
 
 
@@ -28,10 +31,7 @@ def command_line_arg_defined(argument: str) -> bool:
                 True if argument is declared, False otherwise
     """
 
-    if "--" + argument in sys.argv:
-        return True
-    else:
-        return False
+    return argument in cli_args_dict()
 
 
 def read_all_cli_args_to_dict() -> dict:
@@ -40,10 +40,64 @@ def read_all_cli_args_to_dict() -> dict:
             Returns:
                 argument_dict -- A dict of all cli arguments key/value pair
         """
-    argument_dict = {}
+    return {
+        argument: list(argument_value) if isinstance(argument_value, list) else argument_value
+        for argument, argument_value in cli_args_dict().items()
+    }
+
+
+def cli_args_dict() -> dict:
+    """Returns the dict of all cli args, only parsing sys.argv if it's a different list (or it's length changed) since it
+        was last parsed, the dict is shared between calls so it should not be changed.
+
+            Returns:
+                argument_dict -- A dict of all cli arguments key/value pair
+    """
+    global parsed_cli_args
     arg_list = sys.argv
-    for argument in arg_list:
-        if argument.startswith("--"):
-            key_index = arg_list.index(argument) + 1
-            argument_dict[argument[2:]] = arg_list[key_index]
+    parsed_arg_list, parsed_arg_list_length, argument_dict = parsed_cli_args
+    if parsed_arg_list is not arg_list or parsed_arg_list_length != len(arg_list):
+        argument_dict = parse_cli_args(arg_list)
+        parsed_cli_args = (arg_list, len(arg_list), argument_dict)
+    return argument_dict
+
+
+def parse_cli_args(arg_list: list) -> dict:
+    """Parse a list of cli args in a single pass to a dict of all the args that start with --, supports both the
+        "--key value" & "--key=value" formats, an arg that is not followed by a value is given the value of True & an arg
+        that is given multiple times has all of it's values returned as a list, all args after a "--" arg are ignored.
+
+            Arguments:
+                arg_list -- the list of the cli args (in the same format as sys.argv)
+            Returns:
+                argument_dict -- A dict of all cli arguments key/value pair
+    """
+    argument_dict = {}
+    repeated_arguments = set()
+    arg_index = 0
+    while arg_index < len(arg_list):
+        argument = arg_list[arg_index]
+        arg_index += 1
+        if argument.startswith("--") is False:
+            continue
+        if argument == "--":
+            break
+
+        if "=" in argument:
+            argument, argument_value = argument[2:].split("=", 1)
+        elif arg_index < len(arg_list) and arg_list[arg_index].startswith("--") is False:
+            argument = argument[2:]
+            argument_value = arg_list[arg_index]
+            arg_index += 1
+        else:
+            argument = argument[2:]
+            argument_value = True
+
+        if argument in repeated_arguments:
+            argument_dict[argument].append(argument_value)
+        elif argument in argument_dict:
+            argument_dict[argument] = [argument_dict[argument], argument_value]
+            repeated_arguments.add(argument)
+        else:
+            argument_dict[argument] = argument_value
     return argument_dict
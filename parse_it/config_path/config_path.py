@@ -0,0 +1,48 @@
+from typing import Any, Tuple
+
+
+def flatten_dict(nested_dict: dict, divider: str = ".") -> dict:
+    """Take a nested dict & return a flat dict of it which has both it's keys & the path to each of the values of it's
+        nested dicts joined by the divider (so {"a": {"b": 1}} becomes {"a": {"b": 1}, "a.b": 1}), the values are the
+        same objects as in the nested dict & a key which already has the divider in it is kept over a path to a nested
+        value with the same name
+
+            Arguments:
+                nested_dict -- the dict to flatten
+                divider -- the string the keys of each path are joined by, defaults to "."
+            Returns:
+                flat_dict -- a dict of all the keys & paths of the nested dict & their values
+    """
+    flat_dict = dict(nested_dict)
+    nested_dicts_to_flatten = [
+        (str(config_key), config_value) for config_key, config_value in nested_dict.items()
+        if isinstance(config_value, dict)
+    ]
+    while nested_dicts_to_flatten:
+        config_path, nested_value = nested_dicts_to_flatten.pop()
+        for config_key, config_value in nested_value.items():
+            config_key_path = config_path + divider + str(config_key)
+            flat_dict.setdefault(config_key_path, config_value)
+            if isinstance(config_value, dict):
+                nested_dicts_to_flatten.append((config_key_path, config_value))
+    return flat_dict
+
+
+def read_config_path(nested_dict: dict, config_path: str, divider: str = ".") -> Tuple[bool, Any]:
+    """Return the value a path of keys joined by the divider leads to in a nested dict (so "a.b" of {"a": {"b": 1}} is
+        1), the path is walked one key at a time so there is no need to flatten the whole dict for a single lookup
+
+            Arguments:
+                nested_dict -- the dict to read the path from
+                config_path -- the keys joined by the divider
+                divider -- the string the keys of the path are joined by, defaults to "."
+            Returns:
+                config_path_found -- True if the path is in the nested dict, False otherwise
+                config_value -- the value the path leads to, None if it's not in the nested dict
+    """
+    config_value = nested_dict
+    for config_key in config_path.split(divider):
+        if not isinstance(config_value, dict) or config_key not in config_value:
+            return False, None
+        config_value = config_value[config_key]
+    return True, config_value
@@ -1,7 +1,5 @@
 import os
-import dpath.util
-import dpath.options
-from typing import Optional, Union
+from typing import Mapping, Optional, Union
 
 
 def read_envvar(envvar: str, force_uppercase: bool = True) -> Optional[str]:
@@ -19,11 +17,53 @@ def read_envvar(envvar: str, force_uppercase: bool = True) -> Optional[str]:
     envvar_value = os.getenv(envvar)
 
     if isinstance(envvar_value, str) is True:
-        # this weird encode and decode is to avoid some cases where envvar get special characters escaped
-        envvar_value = envvar_value.encode('latin1').decode('unicode_escape')
+        envvar_value = decode_envvar_value(envvar_value)
     return envvar_value
 
 
+def decode_envvar_value(envvar_value: str) -> str:
+    """Decode the raw value of an environment variable the same way read_envvar does
+
+            Arguments:
+                envvar_value -- the raw value of the envvar
+            Returns:
+                the decoded value of the envvar
+    """
+    # this weird encode and decode is to avoid some cases where envvar get special characters escaped, values which
+    # can't go through it (non latin1 characters or a broken escape) are kept as is
+    try:
+        return envvar_value.encode('latin1').decode('unicode_escape')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return envvar_value
+
+
+def read_envvars_snapshot(envvar_prefix: str = "", force_uppercase: bool = True,
+                          environ: Optional[Mapping] = None) -> dict:
+    """Read all environment variables starting with the prefix at once and return them in a dict form keyed by their
+        name without the prefix with their values already decoded, if force_uppercase is true the prefix is matched in
+        UPPERCASE and only UPPERCASE envvars are kept as those are the only ones read_envvar can ever find
+
+            Arguments:
+                envvar_prefix -- only envvars starting with said prefix are kept, defaults to "" which keeps all of them
+                force_uppercase -- if the envvar key will be forced to be all in UPPERCASE, defaults to True
+                environ -- an optional copy of the environment to read the envvars from, defaults to os.environ
+            Returns:
+                envvar_snapshot -- A dict of the envvars (without the prefix) & their decoded values
+    """
+    if force_uppercase is True:
+        envvar_prefix = envvar_prefix.upper()
+    envvar_prefix_length = len(envvar_prefix)
+
+    envvar_snapshot = {}
+    for envvar, envvar_value in (os.environ if environ is None else environ).items():
+        if not envvar.startswith(envvar_prefix):
+            continue
+        if force_uppercase is True and envvar != envvar.upper():
+            continue
+        envvar_snapshot[envvar[envvar_prefix_length:]] = decode_envvar_value(envvar_value)
+    return envvar_snapshot
+
+
 def envvar_defined(envvar: str, force_uppercase: bool = True) -> bool:
     """Check if an environment variable is defined, if force_uppercase is true will convert all keys
         to be UPPERCASE
@@ -43,23 +83,32 @@ def envvar_defined(envvar: str, force_uppercase: bool = True) -> bool:
         return False
 
 
-def read_all_envvars_to_dict(force_uppercase: bool = True) -> dict:
+def read_all_envvars_to_dict(force_uppercase: bool = True, envvar_prefix: str = "",
+                             environ: Optional[Mapping] = None) -> dict:
     """Read all environment variables and return them in a dict form, if force_uppercase is true will convert all keys
         to be UPPERCASE
 
             Arguments:
                 force_uppercase -- while counter-intuitive in the naming it means that if the environment variable
                     is uppercase the dict will treat it as the same one as a lowercase one & will return it in
-                    lowercase form (name saved to match all the other uses of said function)
+                    lowercase form (name saved to match all the other uses of said function), the envvar_prefix is also
+                    matched regardless of case if set to True
+                envvar_prefix -- only envvars starting with said prefix are read & the prefix is removed from their
+                    keys, defaults to "" which reads all envvars
+                environ -- an optional copy of the environment to read the envvars from, defaults to os.environ
             Returns:
                 envvar_dict -- A dict of all environment variables key/value pairs
     """
+    if force_uppercase is True:
+        envvar_prefix = envvar_prefix.lower()
+    envvar_prefix_length = len(envvar_prefix)
+
     envvar_dict = {}
-    for envvar in os.environ:
+    for envvar, envvar_value in (os.environ if environ is None else environ).items():
         if force_uppercase is True:
-            envvar_dict[envvar.lower()] = os.environ.get(envvar)
-        else:
-            envvar_dict[envvar] = os.environ.get(envvar)
+            envvar = envvar.lower()
+        if envvar.startswith(envvar_prefix):
+            envvar_dict[envvar[envvar_prefix_length:]] = envvar_value
     return envvar_dict
 
 
@@ -91,20 +140,33 @@ def split_envvar(envvar: Union[str, list], value: str, divider: str = "_"):
     return envvar_dict
 
 
-def split_envvar_combained_dict(divider: str = "_", force_uppercase: bool = True):
+def split_envvar_combained_dict(divider: str = "_", force_uppercase: bool = True, envvar_prefix: str = "",
+                                environ: Optional[Mapping] = None):
     """Returns a dict of all envvars that has had their keys split by the divider into nested dicts
 
                     Arguments:
                         divider -- the string letter by which to divide the envvar key by, defaults to "_"
                         force_uppercase -- if the envvar key will be forced to be all in UPPERCASE, defaults to True
+                        envvar_prefix -- only envvars starting with said prefix are split & the prefix is removed from
+                            their keys before splitting them, defaults to "" which splits all envvars
+                        environ -- an optional copy of the environment to read the envvars from, defaults to
+                            os.environ
                     Returns:
                         envvar_split_dict -- A dict that is the result of all envvars being split by the divider with
                             the value appended as the bottom most of the nest key
     """
-    envvar_dict = read_all_envvars_to_dict(force_uppercase=force_uppercase)
+    envvar_dict = read_all_envvars_to_dict(force_uppercase=force_uppercase, envvar_prefix=envvar_prefix,
+                                           environ=environ)
     envvar_split_dict = {}
     for envvar_key, envvar_value in envvar_dict.items():
-        dpath.options.ALLOW_EMPTY_STRING_KEYS=True
-        temp_split_envvar = split_envvar(envvar_key, envvar_value, divider=divider)
-        dpath.util.merge(envvar_split_dict, temp_split_envvar)
+        # each key is split once & inserted directly into the shared nested dict, a later envvar overrides an earlier
+        # one on conflicts so a value in the way of a nested key is replaced by a dict & vice versa
+        envvar_nest = envvar_split_dict
+        *envvar_parent_keys, envvar_leaf_key = envvar_key.split(divider)
+        for envvar_parent_key in envvar_parent_keys:
+            envvar_child_nest = envvar_nest.get(envvar_parent_key)
+            if not isinstance(envvar_child_nest, dict):
+                envvar_child_nest = envvar_nest[envvar_parent_key] = {}
+            envvar_nest = envvar_child_nest
+        envvar_nest[envvar_leaf_key] = envvar_value
     return envvar_split_dict
@@ -0,0 +1,89 @@
+from typing import Optional
+import hashlib
+import marshal
+import sys
+import os
+
+
+# the compiled cache file starts with a header of the magic, the version of the compiled cache format, the marshal
+# format version & the python version (as marshal data is only guaranteed to be readable by the same python version)
+COMPILED_CACHE_MAGIC = b"PARSEIT\0"
+COMPILED_CACHE_VERSION = 1
+COMPILED_CACHE_HEADER = COMPILED_CACHE_MAGIC + "{0} {1} {2}.{3}\n".format(
+    COMPILED_CACHE_VERSION, marshal.version, sys.version_info[0], sys.version_info[1]).encode()
+
+
+def read_compiled_cache(compiled_cache_file: str) -> Optional[dict]:
+    """Read a compiled cache file written by write_compiled_cache, a missing, broken or outdated (written by another
+        version of the format or of python) file is treated as if there is no compiled cache
+
+            Arguments:
+                compiled_cache_file -- the path of the compiled cache file
+            Returns:
+                compiled_cache -- the dict the compiled cache was written from, None if it can't be used
+    """
+    try:
+        with open(compiled_cache_file, "rb") as f:
+            if f.read(len(COMPILED_CACHE_HEADER)) != COMPILED_CACHE_HEADER:
+                return None
+            # reading the whole file first is much faster then having marshal read it from the file object
+            compiled_cache = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(compiled_cache, dict):
+        return None
+    return compiled_cache
+
+
+def write_compiled_cache(compiled_cache_file: str, compiled_cache: dict):
+    """Write a compiled cache file, the file is written to a temporary file which then replaces the old one so a reader
+        never sees a partially written file
+
+            Arguments:
+                compiled_cache_file -- the path of the compiled cache file
+                compiled_cache -- a dict made only of types marshal can write (dict, list, tuple, str, bytes, int,
+                    float, bool & None)
+    """
+    compiled_cache_temp_file = compiled_cache_file + "." + str(os.getpid()) + ".tmp"
+    try:
+        with open(compiled_cache_temp_file, "wb") as f:
+            f.write(COMPILED_CACHE_HEADER)
+            marshal.dump(compiled_cache, f)
+        os.replace(compiled_cache_temp_file, compiled_cache_file)
+    finally:
+        if os.path.exists(compiled_cache_temp_file):
+            os.remove(compiled_cache_temp_file)
+
+
+def can_be_compiled(file_dict: dict) -> bool:
+    """Check if a parsed file can be written to the compiled cache, files with values marshal can't write (for example
+        the dates yaml & toml files can have) are left out of it
+
+            Arguments:
+                file_dict -- the parsed dict of the file
+            Returns:
+                True if the parsed file can be written to the compiled cache, False otherwise
+    """
+    try:
+        marshal.dumps(file_dict)
+    except ValueError:
+        return False
+    return True
+
+
+def file_sha256(file_path: str) -> Optional[str]:
+    """Return the sha256 hash of a file contents
+
+            Arguments:
+                file_path -- the path of the file
+            Returns:
+                file_hash -- the hex sha256 hash of the file contents, None if the file can't be read
+    """
+    file_hash = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as f:
+            for file_chunk in iter(lambda: f.read(1024 * 1024), b""):
+                file_hash.update(file_chunk)
+    except OSError:
+        return None
+    return file_hash.hexdigest()
@@ -1,7 +1,13 @@
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
-import os
+from typing import Iterator, Optional, Union
 import warnings
+import mmap
+import os
+
+
+# files of at least this size are memory mapped by read_file_bytes rather then read to memory
+MMAP_THRESHOLD = 1024 * 1024
 
 
 def read_file(file_path: str) -> Optional[str]:
@@ -20,6 +26,41 @@ def read_file(file_path: str) -> Optional[str]:
         return None
 
 
+@contextmanager
+def read_file_bytes(file_path: str, use_mmap: bool = True) -> Iterator[Optional[Union[bytes, mmap.mmap]]]:
+    """Read a file as bytes without decoding it, files of at least MMAP_THRESHOLD bytes are memory mapped rather then
+        read so parsers which accept bytes get the file contents without a copy of it, the memory map is only valid
+        inside the with block.
+
+     Arguments:
+        file_path -- the path of the file to be read
+        use_mmap -- if set to False the file is always read to memory, for parsers that would only copy the memory
+            map to bytes anyway, defaults to True
+    Returns:
+        file_contents -- the bytes of the file contents (or a read only memory map of them), None if the file does not
+            exist
+    """
+    try:
+        f = open(file_path, "rb")
+    except FileNotFoundError:
+        yield None
+        return
+
+    with f:
+        file_mmap = None
+        if use_mmap is True and os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            # files that can't be memory mapped (pipes, special files, etc...) are read as usual
+            try:
+                file_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                file_mmap = None
+        if file_mmap is None:
+            yield f.read()
+        else:
+            with file_mmap:
+                yield file_mmap
+
+
 def folder_exists(folder_path: str) -> bool:
     """Returns True if folder exists, False otherwise.
 
@@ -63,42 +104,85 @@ def strip_trailing_slash(folder_path: str) -> str:
     return folder_path
 
 
-def file_types_in_folder(folder_path: str, file_types_endings: list, recurse: bool = True) -> dict:
-    """list all the config file types found inside the given folder based on the filename extension
+def file_types_in_folder(folder_path: str, file_types_endings: list, recurse: bool = True,
+                         folders_mtimes: Optional[dict] = None) -> dict:
+    """list all the config file types found inside the given folder based on the filename extension, the folder (and
+        all subfolders if recurse is True) is only scanned once no matter how many file types are looked for
 
         Arguments:
             folder_path -- the path of the folder to be checked
             file_types_endings -- list of file types to look for
             recurse -- if True (default) will also look in all subfolders
+            folders_mtimes -- an optional dict which will be filled with the modification time of each folder scanned
+                keyed by it's path, as a folder modification time changes when a file is added to or removed from it
+                comparing them is enough to know if the folder needs to be scanned again
         Returns:
             config_files_dict -- dict of {file_type: [list_of_file_names_of_said_type]}
     """
     folder_path = strip_trailing_slash(folder_path)
+    config_files_dict = {}
+    for file_type_ending in file_types_endings:
+        config_files_dict[file_type_ending] = []
+
     if folder_exists(folder_path) is False:
         warnings.warn("config_location " + folder_path + " does not exist, only envvars & cli args will be used")
-        config_files_dict = {}
-        for file_type_ending in file_types_endings:
-            config_files_dict[file_type_ending] = []
     else:
-        config_files_dict = {}
+        folders_to_scan = [folder_path]
+        while folders_to_scan:
+            scanned_folder = folders_to_scan.pop()
+            try:
+                if folders_mtimes is not None:
+                    folders_mtimes[scanned_folder] = os.stat(scanned_folder).st_mtime_ns
+                with os.scandir(scanned_folder) as folder_entries:
+                    for folder_entry in folder_entries:
+                        if recurse is True:
+                            # symlinks to folders are not followed to avoid endless loops
+                            if folder_entry.is_dir():
+                                if folder_entry.is_symlink() is False:
+                                    folders_to_scan.append(folder_entry.path)
+                                continue
+                        elif folder_entry.is_file() is False:
+                            continue
+
+                        for file_suffix in file_suffixes(folder_entry.name):
+                            if file_suffix in config_files_dict:
+                                config_files_dict[file_suffix].append(
+                                    _config_file_name(folder_path, scanned_folder, folder_entry))
+            except OSError:
+                continue
+
         for file_type_ending in file_types_endings:
-            config_files_dict[file_type_ending] = []
-            if recurse is True:
-                for root, subFolders, files in os.walk(folder_path, topdown=True):
-                    for file in files:
-                        if file.endswith("." + file_type_ending):
-                            if folder_path + "/" in root:
-                                original_root_path = root
-                                if root[0] != "/":
-                                    root = root.split(folder_path + "/", 1)[1]
-                                config_files_dict[file_type_ending].append(os.path.join(root, file))
-                                if original_root_path != root:
-                                    root = original_root_path
-                            else:
-                                config_files_dict[file_type_ending].append(file)
-            else:
-                for file in os.listdir(folder_path):
-                    if os.path.isfile(os.path.join(folder_path, file)) and file.endswith(file_type_ending):
-                        config_files_dict[file_type_ending].append(file)
             config_files_dict[file_type_ending].sort()
     return config_files_dict
+
+
+def file_suffixes(file_name: str) -> list:
+    """list all the possible suffixes of a file name, a file name with multiple dots (my.config.yaml) has a suffix
+        for each of them (config.yaml & yaml)
+
+        Arguments:
+            file_name -- the name of the file
+        Returns:
+            suffixes_list -- a list of all the possible suffixes of the file name, longest first
+    """
+    file_name_parts = file_name.split(".")
+    return [".".join(file_name_parts[part_index:]) for part_index in range(1, len(file_name_parts))]
+
+
+def _config_file_name(folder_path: str, scanned_folder: str, folder_entry: os.DirEntry) -> str:
+    """returns the name of a config file as listed in the file_types_in_folder dict, files in the folder itself are
+        listed by their name & files in subfolders by their path relative to the folder (or by their full path if
+        the folder path is absolute)
+
+        Arguments:
+            folder_path -- the path of the folder that is being checked
+            scanned_folder -- the path of the (sub)folder the file is in
+            folder_entry -- the os.scandir entry of the file
+        Returns:
+            config_file_name -- the name of the config file
+    """
+    if scanned_folder == folder_path:
+        return folder_entry.name
+    if folder_path.startswith("/"):
+        return folder_entry.path
+    return folder_entry.path[len(folder_path) + 1:]
@@ -0,0 +1,99 @@
+import importlib
+import functools
+from typing import Callable, Optional, Union, Tuple
+
+
+# the registry of all the file types parse_it can parse, each file type has a list of the file suffixes it's used for &
+# the function which parses it, builtin file types are registered with the module & name of their parsing function so
+# said module is only imported the first time a file of it's type is parsed
+FILE_TYPES = {}
+
+
+def register_file_type(file_type: str, suffixes: list, parser: Union[Callable[[str], dict], Tuple[str, str]],
+                       parses_keys: bool = False):
+    """Register a file type (or replace the registration of an existing one) so parse_it will be able to parse it.
+
+            Arguments:
+                file_type -- the name of the file type (json, yaml, etc...)
+                suffixes -- a list of the file suffixes of said file type
+                parser -- either a function which takes a path to a file of said type & returns it as a dict or a
+                    (module, function name) tuple of said function to import it only when it's first used
+                parses_keys -- if set to True the parsing function also takes a keys argument (a set of the top level
+                    keys to parse) & only parses said keys of the file, if set to False (default) the file is fully
+                    parsed & the keys are picked from it's dict
+    """
+    if callable(parser) is True:
+        FILE_TYPES[file_type] = {
+            "suffixes": list(suffixes),
+            "parser_module": None,
+            "parser_function": parser.__name__,
+            "parser": parser,
+            "parses_keys": parses_keys
+        }
+    else:
+        FILE_TYPES[file_type] = {
+            "suffixes": list(suffixes),
+            "parser_module": parser[0],
+            "parser_function": parser[1],
+            "parser": None,
+            "parses_keys": parses_keys
+        }
+
+
+def load_file_parser(file_type: str, keys: Optional[frozenset] = None) -> Callable[[str], dict]:
+    """Return the parsing function of a file type, importing it's module first if it's the first time it's used.
+
+            Arguments:
+                file_type -- the file type to get the parsing function of (json, yaml, etc...)
+                keys -- an optional set of the top level keys to parse, if set the returned function only returns said
+                    keys of the file, if set to None (default) the whole file is returned
+            Returns:
+                the function which takes a path to a file of said type & returns it as a dict
+    """
+    file_type_registration = FILE_TYPES[file_type]
+    if file_type_registration["parser"] is None:
+        file_type_registration["parser"] = getattr(importlib.import_module(file_type_registration["parser_module"]),
+                                                   file_type_registration["parser_function"])
+    if keys is None:
+        return file_type_registration["parser"]
+    # partials of module level functions are used so the parsing function can still be sent to a process pool
+    if file_type_registration["parses_keys"] is True:
+        return functools.partial(file_type_registration["parser"], keys=keys)
+    return functools.partial(parse_file_keys, file_type_registration["parser"], keys)
+
+
+def parse_file_keys(parser: Callable[[str], dict], keys: frozenset, path_to_file: str) -> dict:
+    """Parse a file with a parsing function that parses the whole file & return only the given top level keys of it.
+
+            Arguments:
+                parser -- the function which takes a path to a file & returns it as a dict
+                keys -- a set of the top level keys to return
+                path_to_file -- the path of the file
+            Returns:
+                config_file_dict -- dict of the given keys of the file
+    """
+    file_dict = parser(path_to_file)
+    return {key: value for key, value in file_dict.items() if key in keys}
+
+
+def file_type_of_parser_function(parser_function: str) -> Optional[str]:
+    """Return the file type a parsing function is registered to.
+
+            Arguments:
+                parser_function -- the name of the parsing function (parse_json_file, parse_yaml_file, etc...)
+            Returns:
+                the file type the parsing function is registered to, None if it's not registered to any of them
+    """
+    for file_type, file_type_registration in FILE_TYPES.items():
+        if file_type_registration["parser_function"] == parser_function:
+            return file_type
+    return None
+
+
+register_file_type("env", ["env"], ("parse_it.file.env", "parse_env_file"))
+register_file_type("json", ["json"], ("parse_it.file.json", "parse_json_file"), parses_keys=True)
+register_file_type("yaml", ["yaml", "yml"], ("parse_it.file.yaml", "parse_yaml_file"))
+register_file_type("toml", ["toml", "tml"], ("parse_it.file.toml", "parse_toml_file"))
+register_file_type("hcl", ["hcl", "tf"], ("parse_it.file.hcl", "parse_hcl_file"))
+register_file_type("ini", ["conf", "cfg", "ini"], ("parse_it.file.ini", "parse_ini_file"))
+register_file_type("xml", ["xml"], ("parse_it.file.xml", "parse_xml_file"), parses_keys=True)
@@ -1,13 +1,166 @@
 from parse_it.file.file_reader import *
+from typing import Optional, Union
 import json
+import mmap
+import re
 
+# orjson is used when installed as it's much faster then the builtin json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def parse_json_file(path_to_json_file: str) -> dict:
+# the whitespace between json tokens, a json string, a json scalar (a number, true, false & null as well as the NaN &
+# Infinity the builtin json module accepts) & the next bracket outside of a string with everything before it, which is
+# used to walk over a nested value without matching each of the values inside it
+JSON_WHITESPACE_PATTERN = re.compile(rb'[ \t\n\r]*')
+JSON_STRING_PATTERN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+JSON_SCALAR_PATTERN = re.compile(
+    rb'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null|NaN|-?Infinity'
+)
+JSON_BRACKET_PATTERN = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*[\[\]{}]')
+JSON_OPENING_BRACKETS = {ord("{"), ord("[")}
+
+
+def parse_json_file(path_to_json_file: str, keys: Optional[frozenset] = None) -> dict:
     """take a path to a JSON file & returns it as a valid python dict.
 
             Arguments:
                 path_to_json_file -- the path of the json file
+                keys -- an optional set of the top level keys to parse, if set only said keys are returned & a large
+                    (memory mapped) file is walked over one top level key at a time so only the values of said keys are
+                    ever parsed, if set to None (default) the whole file is parsed
             Returns:
                 config_file_dict -- dict of the file
     """
-    return json.loads(read_file(path_to_json_file))
+    # a large file is only memory mapped when orjson can parse the memory map directly or when only some of it's keys
+    # are parsed, the builtin json module needs a copy of it as bytes (which it then decodes) so memory mapping the
+    # file would only add to the work
+    with read_file_bytes(path_to_json_file, use_mmap=orjson is not None or keys is not None) as json_file_contents:
+        if keys is not None and isinstance(json_file_contents, mmap.mmap):
+            return parse_json_keys(json_file_contents, keys)
+        json_file_dict = parse_json_bytes(json_file_contents)
+    if keys is not None and isinstance(json_file_dict, dict):
+        json_file_dict = {key: value for key, value in json_file_dict.items() if key in keys}
+    return json_file_dict
+
+
+def parse_json_bytes(json_file_contents: Union[bytes, mmap.mmap, None]) -> dict:
+    """take the bytes of a JSON document & returns it as a valid python dict.
+
+            Arguments:
+                json_file_contents -- the bytes (or memory mapped file) of the json document
+            Returns:
+                config_file_dict -- dict of the json document
+    """
+    if orjson is not None and json_file_contents is not None:
+        # orjson is stricter then the builtin json module (NaN, integers bigger then 64 bit) so anything it can't
+        # parse falls back to the builtin json module
+        try:
+            with memoryview(json_file_contents) as json_file_view:
+                return orjson.loads(json_file_view)
+        except (orjson.JSONDecodeError, TypeError):
+            pass
+    if isinstance(json_file_contents, mmap.mmap):
+        json_file_contents = json_file_contents[:]
+    return json.loads(json_file_contents)
+
+
+def parse_json_keys(json_file_contents: Union[bytes, mmap.mmap], keys: frozenset) -> dict:
+    """take the bytes of a JSON document & returns only the given top level keys of it, the document is walked over one
+        top level key at a time & only the values of said keys are parsed so the rest of the document is never held in
+        memory as python objects, a document which isn't a json object is parsed as is, the separators between the top
+        level keys & values are checked the same way a full parse would so a malformed document is always rejected
+        while the values which aren't parsed are only checked to be a valid scalar or to have balanced brackets
+
+            Arguments:
+                json_file_contents -- the bytes (or memory mapped file) of the json document
+                keys -- a set of the top level keys to parse
+            Returns:
+                config_file_dict -- dict of the given keys of the json document
+    """
+    json_position, json_byte = skip_json_whitespace(json_file_contents, 0)
+    if json_byte != ord("{"):
+        return parse_json_bytes(json_file_contents)
+
+    json_file_dict = {}
+    json_position, json_byte = skip_json_whitespace(json_file_contents, json_position + 1)
+    # an empty object has no keys to walk over
+    if json_byte != ord("}"):
+        while True:
+            json_key = JSON_STRING_PATTERN.match(json_file_contents, json_position)
+            if json_key is None:
+                raise ValueError
+            json_position, json_byte = skip_json_whitespace(json_file_contents, json_key.end())
+            if json_byte != ord(":"):
+                raise ValueError
+            json_value_start, json_position = skip_json_value(json_file_contents, json_position + 1)
+            # a key which is repeated is taken from it's last appearance same as when the whole document is parsed
+            json_key = json.loads(json_key.group())
+            if json_key in keys:
+                json_file_dict[json_key] = parse_json_bytes(json_file_contents[json_value_start:json_position])
+            json_position, json_byte = skip_json_whitespace(json_file_contents, json_position)
+            if json_byte == ord("}"):
+                break
+            if json_byte != ord(","):
+                raise ValueError
+            json_position, _ = skip_json_whitespace(json_file_contents, json_position + 1)
+
+    # nothing but whitespace can come after the object
+    if skip_json_whitespace(json_file_contents, json_position + 1)[1] is not None:
+        raise ValueError
+    return json_file_dict
+
+
+def skip_json_whitespace(json_file_contents: Union[bytes, mmap.mmap], json_position: int) -> tuple:
+    """walk over the whitespace between json tokens
+
+            Arguments:
+                json_file_contents -- the bytes (or memory mapped file) of the json document
+                json_position -- the offset the whitespace starts at
+            Returns:
+                json_position -- the offset of the first byte after the whitespace
+                json_byte -- said byte, None if the document ends before it
+    """
+    json_position = JSON_WHITESPACE_PATTERN.match(json_file_contents, json_position).end()
+    if json_position >= len(json_file_contents):
+        return json_position, None
+    return json_position, json_file_contents[json_position]
+
+
+def skip_json_value(json_file_contents: Union[bytes, mmap.mmap], json_position: int) -> tuple:
+    """walk over a single json value (which can be an object or an array holding any number of values)
+
+            Arguments:
+                json_file_contents -- the bytes (or memory mapped file) of the json document
+                json_position -- the offset the value (or the whitespace before it) starts at
+            Returns:
+                json_value_start -- the offset of the first byte of the value
+                json_value_end -- the offset after the last byte of the value
+    """
+    json_value_start, json_byte = skip_json_whitespace(json_file_contents, json_position)
+    if json_byte is None:
+        raise ValueError
+    if json_byte not in JSON_OPENING_BRACKETS:
+        if json_byte == ord('"'):
+            json_value = JSON_STRING_PATTERN.match(json_file_contents, json_value_start)
+        else:
+            json_value = JSON_SCALAR_PATTERN.match(json_file_contents, json_value_start)
+        if json_value is None:
+            raise ValueError
+        return json_value_start, json_value.end()
+
+    # only the brackets of a nested value are matched one by one, the strings & scalars between them are skipped by
+    # the regex itself
+    json_position = json_value_start + 1
+    json_depth = 1
+    while json_depth > 0:
+        json_bracket = JSON_BRACKET_PATTERN.match(json_file_contents, json_position)
+        if json_bracket is None:
+            raise ValueError
+        json_position = json_bracket.end()
+        if json_file_contents[json_position - 1] in JSON_OPENING_BRACKETS:
+            json_depth += 1
+        else:
+            json_depth -= 1
+    return json_value_start, json_position
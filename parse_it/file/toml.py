@@ -1,5 +1,10 @@
 from parse_it.file.file_reader import *
-import toml
+
+# the builtin tomllib (Python 3.11 & higher) is used when available as it's faster then the toml package
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
 
 
 def parse_toml_file(path_to_toml_file: str) -> dict:
@@ -10,4 +15,13 @@ def parse_toml_file(path_to_toml_file: str) -> dict:
             Returns:
                 config_file_dict -- dict of the file
     """
-    return toml.loads(read_file(path_to_toml_file))
+    toml_file_contents = read_file(path_to_toml_file)
+    if tomllib is not None:
+        # tomllib follows the TOML spec more strictly then the toml package so anything it can't parse falls back to
+        # the toml package
+        try:
+            return tomllib.loads(toml_file_contents)
+        except tomllib.TOMLDecodeError:
+            pass
+    import toml
+    return toml.loads(toml_file_contents)
@@ -1,15 +1,61 @@
 from parse_it.file.file_reader import *
+from typing import Optional, Union
+from xml.parsers import expat
 import xmltodict
-import json
+import mmap
 
 
-def parse_xml_file(path_to_xml_file: str) -> dict:
+# the size of the chunks the start of an XML file is read in when looking for it's root element
+XML_ROOT_ELEMENT_CHUNK_SIZE = 64 * 1024
+
+
+class XmlRootElementFound(Exception):
+    """raised by the expat handler to stop parsing once the root element of an XML file is found"""
+
+
+def parse_xml_file(path_to_xml_file: str, keys: Optional[set] = None) -> dict:
     """take a path to a XML file & returns it as a valid python dict.
 
             Arguments:
                 path_to_xml_file -- the path of the xml file
+                keys -- an optional set of the keys that are needed, the only key of an XML file is it's root element
+                    so if it's not one of them the file is not parsed past the root element start & an empty dict is
+                    returned, if set to None (default) the whole file is parsed, parse_it passes the declared_keys of
+                    the parse_it object as said keys (& nothing else) so the projection is only ever at the root
+                    element
             Returns:
                 config_file_dict -- dict of the file
     """
-    # the dump & load to/from JSON is to change it from ordered dict to a normal dict
-    return json.loads(json.dumps(xmltodict.parse(read_file(path_to_xml_file))))
+    # the file is handed to expat as bytes (or as a memory map of them for large files which expat then reads in chunks)
+    # so it's never decoded to a string first, plain dicts are built directly rather then ordered dicts
+    with read_file_bytes(path_to_xml_file) as xml_file_contents:
+        if keys is not None and xml_file_contents is not None:
+            xml_root_element = read_xml_root_element(xml_file_contents)
+            if xml_root_element is not None and xml_root_element not in keys:
+                return {}
+        return xmltodict.parse(xml_file_contents, dict_constructor=dict)
+
+
+def read_xml_root_element(xml_file_contents: Union[bytes, mmap.mmap]) -> Optional[str]:
+    """returns the name of the root element of an XML document, only the start of the document up to the root element
+        is parsed
+
+            Arguments:
+                xml_file_contents -- the bytes of the XML document
+            Returns:
+                xml_root_element -- the name of the root element, None if the document has no valid root element
+    """
+    def stop_at_root_element(name: str, attributes: Union[dict, list]):
+        raise XmlRootElementFound(name)
+
+    xml_parser = expat.ParserCreate()
+    xml_parser.StartElementHandler = stop_at_root_element
+    try:
+        for chunk_start in range(0, len(xml_file_contents), XML_ROOT_ELEMENT_CHUNK_SIZE):
+            xml_parser.Parse(xml_file_contents[chunk_start:chunk_start + XML_ROOT_ELEMENT_CHUNK_SIZE], False)
+        xml_parser.Parse(b"", True)
+    except XmlRootElementFound as e:
+        return e.args[0]
+    except expat.ExpatError:
+        return None
+    return None
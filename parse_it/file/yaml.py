@@ -1,6 +1,9 @@
 from parse_it.file.file_reader import *
 import yaml
 
+# the libyaml based loader is used when PyYAML is built with it as it's much faster then the pure python one
+YAML_LOADER = getattr(yaml, "CFullLoader", yaml.FullLoader)
+
 
 def parse_yaml_file(path_to_yaml_file: str) -> dict:
     """take a path to a YAML file & returns it as a valid python dict.
@@ -10,4 +13,4 @@ def parse_yaml_file(path_to_yaml_file: str) -> dict:
             Returns:
                 config_file_dict -- dict of the file
     """
-    return yaml.load(read_file(path_to_yaml_file), Loader=yaml.FullLoader)
+    return yaml.load(read_file(path_to_yaml_file), Loader=YAML_LOADER)
@@ -1,16 +1,24 @@
 from parse_it.command_line_args.command_line_args import *
 from parse_it.envvars.envvars import *
-from parse_it.file.yaml import *
-from parse_it.file.ini import *
-from parse_it.file.json import *
-from parse_it.file.env import *
-from parse_it.file.hcl import *
-from parse_it.file.toml import *
-from parse_it.file.xml import *
 from parse_it.type_estimate.type_estimate import *
 from parse_it.file.file_reader import *
-from typing import Any, Tuple, Optional
+from parse_it.file.file_types import *
+from parse_it.file.compiled_cache import *
+from parse_it.config_path.config_path import *
+from parse_it.snapshot.snapshot import *
+from typing import Any, Tuple, Optional, Union
+import concurrent.futures
+import threading
 import warnings
+import bisect
+import copy
+import os
+
+
+# parallel parsing only kicks in when at least this many files (& this many bytes) need to be parsed, below it the
+# overhead of starting the workers is larger then the time parsing the files takes
+PARALLEL_PARSING_MIN_FILES = 4
+PARALLEL_PARSING_MIN_BYTES = 64 * 1024
 
 
 class ParseIt:
@@ -19,7 +27,10 @@ class ParseIt:
                  type_estimate: bool = True, recurse: bool = False, force_envvars_uppercase: bool = True,
                  config_location: Optional[str] = None, envvar_prefix: Optional[str] = None,
                  custom_suffix_mapping: Optional[dict] = None, envvar_divider: Optional[str] = None,
-                 none_values: Optional[set] = None):
+                 none_values: Optional[set] = None, type_estimate_cache_size: Optional[int] = None,
+                 parallel_parsing: Optional[str] = None, max_workers: Optional[int] = None,
+                 compiled_cache_location: Optional[str] = None, config_key_divider: Optional[str] = None,
+                 declared_keys: Optional[list] = None):
         """configures the object which is used to query all types of configuration inputs available and prioritize them
                 based on your needs
 
@@ -49,51 +60,43 @@ class ParseIt:
                             nesting is disabled
                         none_values -- A tuple with values that should be considered `None`, if set to None (default) it
                             will take the default set tuple of {"", "null", "none"}
+                        type_estimate_cache_size -- the maximum number of values the type estimation of is remembered so
+                            the same value is only estimated once, the cache stats are available from the
+                            type_estimate_cache.cache_info() function, if set to None (default) the cache is disabled
+                        parallel_parsing -- if set to "threads" or "processes" the config files are parsed in parallel
+                            on a pool of threads or processes (useful for the pure python parsers like hcl & xml) before
+                            being merged in the same priority order as always, small inputs are still parsed serially,
+                            if set to None (default) all files are parsed serially, note that with "processes" custom
+                            file types parsers must be importable functions
+                        max_workers -- the maximum number of threads/processes used by parallel_parsing, if set to None
+                            (default) the concurrent.futures default is used
+                        compiled_cache_location -- the path of a file the parsed config files (alongside their
+                            size, modification time & hash) & the list of config files are written to after they are
+                            parsed, on the next start the config files that didn't change are taken from it rather
+                            then parsed (& the config folder isn't scanned if no file was added or removed from it),
+                            if set to None (default) no compiled cache is used
+                        config_key_divider -- the divider of the keys of a path to a nested configuration value, if set
+                            (for example to "." or "/") reading "database.pool.size" will return the value of the "size"
+                            key inside the "pool" dict inside the "database" dict of the highest priority source that
+                            holds said path, when envvar_divider is also set the path is matched to the envvar with it's
+                            divider in place of the config_key_divider (DATABASE_POOL_SIZE), if set to None (default)
+                            only top level keys are read
+                        declared_keys -- an optional list of the only configuration keys that will be read, if set only
+                            said keys are kept from each source (& type estimated) & large json files are walked over
+                            one top level key at a time so only the values of said keys are ever parsed, which keeps
+                            the memory use low for huge config files, xml files which root element isn't declared
+                            aren't parsed past it, other keys are treated as if they are not configured, when
+                            config_key_divider is set a path declares the top level key it starts with, if set to None
+                            (default) all keys are read
         """
 
         # first we describe the standard file type suffix mapping and what file types are are standard file extensions
-        self.suffix_file_type_mapping = {
-            "env": [
-                "env"
-            ],
-            "json": [
-                "json"
-            ],
-            "yaml": [
-                "yaml",
-                "yml"
-            ],
-            "toml": [
-                "toml",
-                "tml"
-            ],
-            "hcl": [
-                "hcl",
-                "tf"
-            ],
-            "ini": [
-                "conf",
-                "cfg",
-                "ini"
-            ],
-            "xml": [
-                "xml"
-            ]
-        }
-        self.valid_file_type_extension = [
-            "env",
-            "json",
-            "yaml",
-            "yml",
-            "toml",
-            "tml",
-            "hcl",
-            "tf",
-            "conf",
-            "cfg",
-            "ini",
-            "xml"
-        ]
+        # based on the registered file types
+        self.suffix_file_type_mapping = {}
+        self.valid_file_type_extension = []
+        for file_type, file_type_registration in FILE_TYPES.items():
+            self.suffix_file_type_mapping[file_type] = list(file_type_registration["suffixes"])
+            self.valid_file_type_extension += file_type_registration["suffixes"]
 
         if envvar_divider is None:
             self.nest_envvars = False
@@ -113,6 +116,22 @@ class ParseIt:
                 warnings.warn("custom_suffix_mapping is defined but config_type_priority is using the default setting, "
                               "custom file suffixes will not be used")
 
+        # and map each suffix to it's file type so finding how to parse a file is a single dict lookup
+        self.suffix_file_types = {}
+        for file_type, file_type_suffixes in self.suffix_file_type_mapping.items():
+            for file_type_suffix in file_type_suffixes:
+                self.suffix_file_types.setdefault(file_type_suffix, file_type)
+
+        self.config_key_divider = config_key_divider
+
+        # the declared keys are kept as the set of top level keys of each source which are to be parsed
+        if declared_keys is None:
+            self.declared_keys = None
+        else:
+            self.declared_keys = frozenset(declared_keys)
+            if config_key_divider is not None:
+                self.declared_keys |= {declared_key.split(config_key_divider, 1)[0] for declared_key in declared_keys}
+
         if envvar_prefix is None:
             self.envvar_prefix = ""
         else:
@@ -153,13 +172,26 @@ class ParseIt:
             if config_type in self.valid_file_type_extension:
                 valid_config_types.append(config_type)
 
+        self.valid_config_types = valid_config_types
+        self.recurse = recurse
+
         # we check if the config is a file or a folder
         self.config_file_type = file_or_folder(self.config_location)
 
-        # if config is dict or not declared populate the config_files_dict with the list of locations for each file type
-        if self.config_file_type == "folder" or self.config_file_type is None:
+        self.compiled_cache_location = compiled_cache_location
+        compiled_cache = self._read_compiled_cache()
+
+        # if config is dict or not declared populate the config_files_dict with the list of locations for each file
+        # type, the modification time of each folder scanned is kept so reload knows when to scan the folders again
+        # & the list in the compiled cache is used if none of the folders changed since it was written
+        self.folders_mtimes = {}
+        if (self.config_file_type == "folder" or self.config_file_type is None) and compiled_cache is not None and \
+                self._folders_unchanged(compiled_cache["folders_mtimes"]) is True:
+            self.folders_mtimes = compiled_cache["folders_mtimes"]
+            self.config_files_dict = compiled_cache["config_files_dict"]
+        elif self.config_file_type == "folder" or self.config_file_type is None:
             self.config_files_dict = file_types_in_folder(self.config_location, valid_config_types,
-                                                          recurse=recurse)
+                                                          recurse=recurse, folders_mtimes=self.folders_mtimes)
         # if the config is a file populate the config_files_dict with that single file and have the rest file types
         # be blank
         elif self.config_file_type == "file":
@@ -174,6 +206,56 @@ class ParseIt:
         else:
             self.none_values = none_values
 
+        if parallel_parsing not in (None, "threads", "processes"):
+            raise ValueError
+        self.parallel_parsing = parallel_parsing
+        self.max_workers = max_workers
+
+        if type_estimate_cache_size is None:
+            self.type_estimate_cache = None
+        else:
+            self.type_estimate_cache = TypeEstimateCache(maxsize=type_estimate_cache_size)
+
+        # parsed config files are cached per instance keyed by their absolute path, the size, mtime & inode of the file
+        # are kept alongside the parsed dict so a file that changed on disk will be re-parsed on the next read
+        self.parsed_files_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # the config files which are listed but were found missing by reload
+        self.missing_config_files = set()
+
+        # the config files the last read stopped before parsing as all the keys it needed were already found
+        self.skipped_config_files = []
+
+        # all the changes to the index & the parsed files cache are done under this lock so a single object can be
+        # shared between threads, the published snapshot is immutable so reading it needs no lock at all
+        self._index_lock = threading.RLock()
+        self.config_snapshot = None
+
+        # the merged config index is built on the first read, see rebuild_index for it's structure, envvars are read
+        # once into a snapshot alongside it, see refresh_envvars
+        self.config_index = None
+        self.config_key_sources = {}
+        self.indexed_sources = {}
+
+        # the hash of each config file in the compiled cache (None if it can't be compiled) alongside the fingerprint &
+        # parsed dict it was taken for keyed by it's absolute path, so a file that didn't change since the compiled
+        # cache was last written isn't hashed & checked again every time it's written
+        self.compiled_files_hashes = {}
+
+        # set whenever a config file is parsed (be it serially or ahead of a merge) so the compiled cache is only
+        # written when there is something new to write to it
+        self.compiled_cache_outdated = False
+
+        # the config files that didn't change since the compiled cache was written are taken from it
+        if compiled_cache is not None:
+            self._load_compiled_files(compiled_cache["files"])
+        self.envvars_snapshot = None
+        self.envvars_dict = None
+        self.envvars_priority = None
+        self.envvars_config_type = None
+
     def read_configuration_variable(self, config_name: str, default_value: Any = None, required: bool = False,
                                     allowed_types: Optional[list] = None) -> Any:
         """reads a single key of the configuration and returns the first value of it found based on the priority of each
@@ -192,45 +274,58 @@ class ParseIt:
                         config_value -- the value of the configuration requested
         """
 
-        # we start with both key not found and the value being None
-        config_value = None
-        config_key_found = False
+        return self._read_configuration_variable(config_name, default_value, required, allowed_types,
+                                                 self._prefetch_config_files())
 
-        # we now loop over all the permitted types of where the config key might be and break on the first one found
-        # after setting config_key_found to True and config_value to the value found
-        for config_type in self.config_type_priority:
-            if config_type == "cli_args":
-                config_key_found = command_line_arg_defined(config_name)
-                if config_key_found is True:
-                    config_value = read_command_line_arg(config_name)
-                    break
-            elif config_type == "envvars" or config_type == "env_vars":
-                config_key_found = envvar_defined(self.envvar_prefix + config_name,
-                                                  force_uppercase=self.force_envvars_uppercase)
-                config_value = read_envvar(self.envvar_prefix + config_name,
-                                           force_uppercase=self.force_envvars_uppercase)
-                if config_key_found is True:
-                    # next the envvar if so desired to assist in matching to other file formats
-                    if self.nest_envvars is True:
-                        config_value = split_envvar(config_name, config_value, divider=self.envvar_divider)
-                    break
+    def _read_configuration_variable(self, config_name: str, default_value: Any, required: bool,
+                                     allowed_types: Optional[list], prefetched_files: dict) -> Any:
+        """internal function which does the work of read_configuration_variable once the config files are checked (&
+                parsed if so desired) ahead of the lookup
 
-            # will loop over all files of each type until all files of all types are searched, first time the key is
-            # found will break outside of both loops
-            elif config_type in self.valid_file_type_extension:
-                for config_file in self.config_files_dict[config_type]:
-                    if self.config_file_type == "file":
-                        file_dict = self._parse_file_per_type(config_type, config_file)
-                    else:
-                        file_dict = self._parse_file_per_type(config_type, os.path.join(self.config_location,
-                                                                                        config_file))
-                    config_key_found, config_value = self._check_config_in_dict(config_name, file_dict)
-                    if config_key_found is True:
-                        break
-                if config_key_found is True:
-                    break
-            else:
-                raise ValueError
+                    Arguments:
+                        config_name -- see read_configuration_variable
+                        default_value -- see read_configuration_variable
+                        required -- see read_configuration_variable
+                        allowed_types -- see read_configuration_variable
+                        prefetched_files -- see _prefetch_config_files
+                    Returns:
+                        config_value -- the value of the configuration requested
+        """
+        # the merged config index holds the winning source of each key so finding the key is a dict lookup rather
+        # then a walk over all the permitted types of where the config key might be
+        return self._config_value(config_name, self._lookup_config_index(config_name, prefetched_files), default_value,
+                                  required, allowed_types)
+
+    def _config_value(self, config_name: str, config_index_entry: Optional[tuple], default_value: Any, required: bool,
+                      allowed_types: Optional[list]) -> Any:
+        """internal function which returns the value of a configuration key from the entry of the source with the
+                highest priority that holds it, see read_configuration_variable
+
+                    Arguments:
+                        config_name -- the configuration key name
+                        config_index_entry -- a (priority, config_type, config_file, value) tuple of the source the
+                            value is taken from, None if the configuration key is not found in any of them
+                        default_value -- see read_configuration_variable
+                        required -- see read_configuration_variable
+                        allowed_types -- see read_configuration_variable
+                    Returns:
+                        config_value -- the value of the configuration requested
+        """
+        if config_index_entry is None:
+            config_key_found = False
+            config_value = None
+        else:
+            config_key_found = True
+            config_priority, config_type, config_file, config_value = config_index_entry
+            if config_type == "envvars" or config_type == "env_vars":
+                # next the envvar if so desired to assist in matching to other file formats, a path to a nested value
+                # is already the value itself
+                if self.nest_envvars is True and not self._is_config_path(config_name):
+                    config_value = split_envvar(config_name, config_value, divider=self.envvar_divider)
+            elif isinstance(config_value, (dict, list, set)):
+                # the value is shared with the index (& the parsed files cache) whatever source it's taken from, be it a
+                # config file or a repeated cli arg, so we hand out a copy to avoid the caller changing it
+                config_value = copy.deepcopy(config_value)
 
         # raise error if the key is required and not found in any of the config files, envvar or cli args
         if config_key_found is False and required is True:
@@ -246,7 +341,8 @@ class ParseIt:
 
         # if type estimation is True try to guess the type of the value
         if self.type_estimate is True:
-            config_value = estimate_type(config_value, none_values=self.none_values)
+            config_value = estimate_type(config_value, none_values=self.none_values,
+                                         type_estimate_cache=self.type_estimate_cache)
 
         # if the type the config is in the end isn't in the list of allowed_types and allowed_types list is set raise
         # a TypeError
@@ -256,14 +352,17 @@ class ParseIt:
 
         return config_value
 
-    def read_multiple_configuration_variables(self, config_names: list, default_value: Any = None,
+    def read_multiple_configuration_variables(self, config_names: Union[list, dict], default_value: Any = None,
                                               required: bool = False, allowed_types: Optional[list] = None) -> dict:
         """reads multiple keys of the configuration and returns the first value of each it found based on the priority
-                of each config file option given in the __init__ of the class, basically a simple loop of the
-                read_configuration_variable function with all the configurable values being the same in all iterations
+                of each config file option given in the __init__ of the class, if the merged config index isn't built
+                yet the sources are walked once in priority order for all the keys & the walk stops as soon as all of
+                them are found so the lower priority config files aren't parsed at all
 
                     Arguments:
-                        config_names -- a list of the configuration key names you want to get the value of
+                        config_names -- a list of the configuration key names you want to get the value of, or a dict of
+                            said names with a dict of the options of each of them (any of default_value, required &
+                            allowed_types) which take the place of the options given to the function for said key
                         default_value -- defaults to None, see config_type_priority in class init for it's use
                         required -- defaults to False, if set to True will ignore default_value & global_default_value
                             and will raise an ValueError if the configuration is not configured in any of the config
@@ -275,14 +374,143 @@ class ParseIt:
                         config_value_dict -- a dict of the key/value pairs of all the configurations requested
         """
 
+        # the config files are only checked ahead when there is an index to refresh, otherwise the sources are walked
+        # one at a time
+        return self._read_multiple_configuration_variables(
+            config_names, default_value, required, allowed_types,
+            None if self.config_index is None else self._prefetch_config_files()
+        )
+
+    def _read_multiple_configuration_variables(self, config_names: Union[list, dict], default_value: Any,
+                                               required: bool, allowed_types: Optional[list],
+                                               prefetched_files: Optional[dict]) -> dict:
+        """internal function which does the work of read_multiple_configuration_variables
+
+                    Arguments:
+                        config_names -- see read_multiple_configuration_variables
+                        default_value -- see read_multiple_configuration_variables
+                        required -- see read_multiple_configuration_variables
+                        allowed_types -- see read_multiple_configuration_variables
+                        prefetched_files -- see _prefetch_config_files, if set to None & the index isn't built yet the
+                            sources are walked once for all the keys rather then building the index
+                    Returns:
+                        config_value_dict -- a dict of the key/value pairs of all the configurations requested
+        """
+        # a dict of configuration key names holds the options of each of them
+        if isinstance(config_names, dict):
+            config_names_options = [(config_name, config_options or {})
+                                    for config_name, config_options in config_names.items()]
+        else:
+            config_names_options = [(config_name, {}) for config_name in config_names]
+        for _, config_options in config_names_options:
+            if not set(config_options) <= {"default_value", "required", "allowed_types"}:
+                raise ValueError
+
+        unique_config_names = list(dict.fromkeys(config_name for config_name, _ in config_names_options))
+        if self.config_index is None and prefetched_files is None:
+            config_index_entries = self._resolve_config_variables(unique_config_names)
+        else:
+            # the index is only refreshed once for all the keys
+            with self._index_lock:
+                self._refresh_index(prefetched_files or {})
+                config_index_entries = {config_name: self._lookup_config_index(config_name)
+                                        for config_name in unique_config_names}
+            self.skipped_config_files = []
+
         config_value_dict = {}
-        for config_name in config_names:
-            config_value_dict[config_name] = self.read_configuration_variable(config_name, default_value, required,
-                                                                              allowed_types)
+        for config_name, config_options in config_names_options:
+            config_value_dict[config_name] = self._config_value(
+                config_name, config_index_entries[config_name], config_options.get("default_value", default_value),
+                config_options.get("required", required), config_options.get("allowed_types", allowed_types)
+            )
         return config_value_dict
 
+    def _resolve_config_variables(self, config_names: list, read_all_envvars: bool = False) -> dict:
+        """internal function which walks the sources once in priority order & finds the source with the highest
+                priority that holds each of the configuration keys, the walk stops as soon as all of them are found
+
+            Arguments:
+                config_names -- a list of the configuration key names to find
+                read_all_envvars -- if set to True the envvars are looked up in the same dict of all the envvars
+                    read_all_configuration_variables merges (nested if envvar_divider is set) rather then in the envvars
+                    snapshot, defaults to False
+            Returns:
+                config_index_entries -- a dict of a (priority, config_type, config_file, value) tuple of each of the
+                    configuration keys (None if it's not found in any of the sources) keyed by it's name
+        """
+        with self._index_lock:
+            config_index_entries = dict.fromkeys(config_names)
+            unresolved_config_names = [config_name for config_name in config_names
+                                       if self._is_declared_key(config_name)]
+            envvars_read = False
+            read_config_files = set()
+
+            for config_priority, config_type in enumerate(self.config_type_priority):
+                if not unresolved_config_names:
+                    break
+                if config_type == "cli_args":
+                    config_sources = [(None, self._declared_keys_dict(read_all_cli_args_to_dict()))]
+                elif config_type == "envvars" or config_type == "env_vars":
+                    # only the first envvars type in the priority list is used, same as when building the index
+                    if envvars_read is True:
+                        continue
+                    envvars_read = True
+                    # the same envvars snapshot the index lookups use, see refresh_envvars
+                    if self.envvars_snapshot is None:
+                        self.refresh_envvars()
+                    if read_all_envvars is True:
+                        config_sources = [(None, self.envvars_dict)]
+                    else:
+                        config_sources = [(None, {
+                            config_name: self.envvars_snapshot[self._envvar_key(config_name)]
+                            for config_name in unresolved_config_names
+                            if self._envvar_key(config_name) in self.envvars_snapshot
+                        })]
+                elif config_type in self.valid_file_type_extension:
+                    # the files are parsed one at a time so the walk can stop before the lower priority files are parsed
+                    config_sources = (
+                        (self._config_file_path(config_file),
+                         self._read_config_file(config_type, config_file, skip_missing=True))
+                        for config_file in self.config_files_dict[config_type]
+                    )
+                else:
+                    raise ValueError
+
+                for config_file_location, source_dict in config_sources:
+                    read_config_files.add(config_file_location)
+                    if source_dict is None:
+                        continue
+                    still_unresolved_config_names = []
+                    for config_name in unresolved_config_names:
+                        if config_name in source_dict:
+                            config_index_entries[config_name] = (config_priority, config_type, config_file_location,
+                                                                 source_dict[config_name])
+                            continue
+                        if self._is_config_path(config_name):
+                            config_path_found, config_value = read_config_path(source_dict, config_name,
+                                                                               self.config_key_divider)
+                            if config_path_found is True:
+                                config_index_entries[config_name] = (config_priority, config_type, config_file_location,
+                                                                     config_value)
+                                continue
+                        still_unresolved_config_names.append(config_name)
+                    unresolved_config_names = still_unresolved_config_names
+                    if not unresolved_config_names:
+                        break
+
+            self.skipped_config_files = []
+            for config_type in self.config_type_priority:
+                if config_type in self.valid_file_type_extension:
+                    for config_file in self.config_files_dict[config_type]:
+                        config_file_location = self._config_file_path(config_file)
+                        if config_file_location not in read_config_files:
+                            self.skipped_config_files.append(config_file_location)
+
+            self._update_compiled_cache()
+            return config_index_entries
+
     def read_all_configuration_variables(self, default_value: Optional[dict] = None, required: Optional[list] = None,
-                                         allowed_types: Optional[dict] = None) -> dict:
+                                         allowed_types: Optional[dict] = None, early_exit: bool = False) -> dict:
         """reads all configuration variables from all allowed sources and returns a dict that includes the combined
                         result of all of them, if a configuration variable exists in two (or more) different sources the
                          one with the higher priority will be the only one returned
@@ -296,38 +524,103 @@ class ParseIt:
                         allowed_types -- Defaults to None, an optional dict of types that are accepted for a variable to
                             be, if set a check will be preformed and if the variables value given is not of any of the
                             types in said list a TypeError will be raised
+                        early_exit -- defaults to False, if set to True only the declared keys (the declared_keys given
+                            in the class init or if not set the keys of default_value, required & allowed_types) are
+                            read, the sources are walked from the highest priority down & the walk stops as soon as all
+                            of said keys are found so the lower priority config files aren't parsed at all, the config
+                            files which were skipped are listed in the skipped_config_files of the object afterwards
                     Returns:
                         config_value_dict -- a dict of the key/value pairs of all the configurations requested
         """
-        # first we create an empty config_value_dict
+        if early_exit is True:
+            return self._read_declared_configuration_variables(default_value, required, allowed_types)
+        # the files that need parsing are parsed in parallel first if so desired, the merge stays serial
+        return self._read_all_configuration_variables(default_value, required, allowed_types,
+                                                      self._prefetch_config_files())
+
+    def _read_declared_configuration_variables(self, default_value: Optional[dict], required: Optional[list],
+                                               allowed_types: Optional[dict]) -> dict:
+        """internal function which does the work of read_all_configuration_variables when early_exit is set
+
+                    Arguments:
+                        default_value -- see read_all_configuration_variables
+                        required -- see read_all_configuration_variables
+                        allowed_types -- see read_all_configuration_variables
+                    Returns:
+                        config_value_dict -- a dict of the key/value pairs of the declared configurations
+        """
+        if self.declared_keys is not None:
+            # a path only declares the top level key it starts with which is read in full
+            config_names = sorted(config_name for config_name in self.declared_keys
+                                  if not self._is_config_path(config_name))
+        else:
+            config_names = list(dict.fromkeys(list(default_value or {}) + list(required or []) +
+                                              list(allowed_types or {})))
+        if not config_names:
+            raise ValueError
+
+        # the envvars are looked up in the same (nested if so desired) dict the full read merges so a nested envvar
+        # such as DB_HOST is found under the db key same as it is when early_exit isn't set
         config_value_dict = {}
+        for config_name, config_index_entry in self._resolve_config_variables(config_names,
+                                                                              read_all_envvars=True).items():
+            if config_index_entry is not None:
+                config_value_dict[config_name] = config_index_entry[3]
+        # the values of the files are shared with the cache so we take a copy
+        config_value_dict = copy.deepcopy(config_value_dict)
+        return self._check_config_value_dict(config_value_dict, default_value, required, allowed_types)
 
-        # now we fill the config_value_dict with the data of all valid sources in reverse order (from least desired to
-        # the most desired source), overwriting each data that is found multiple times with the more desired state
-        data_sources = self.config_type_priority
-        data_sources.reverse()
-        for config_type in data_sources:
-            if config_type == "cli_args":
-                config_value_dict.update(read_all_cli_args_to_dict())
-            elif config_type == "envvars" or config_type == "env_vars":
-                if self.nest_envvars is True:
-                    config_value_dict.update(split_envvar_combained_dict(divider=self.envvar_divider,
-                                                                         force_uppercase=self.force_envvars_uppercase))
-                else:
-                    config_value_dict.update(read_all_envvars_to_dict(force_uppercase=self.force_envvars_uppercase))
-            # will loop over all files of each type until all files of all types are searched, first time the key is
-            # found will break outside of both loops
-            elif config_type in self.valid_file_type_extension:
-                for config_file in self.config_files_dict[config_type]:
-                    if self.config_file_type == "file":
-                        file_dict = self._parse_file_per_type(config_type, config_file)
-                    else:
-                        file_dict = self._parse_file_per_type(config_type, os.path.join(self.config_location,
-                                                                                        config_file))
-                    config_value_dict.update(file_dict)
-            else:
-                raise ValueError
+    def _read_all_configuration_variables(self, default_value: Optional[dict], required: Optional[list],
+                                          allowed_types: Optional[dict], prefetched_files: dict) -> dict:
+        """internal function which does the work of read_all_configuration_variables once the files that are to be
+                parsed ahead of the merge are parsed
+
+                    Arguments:
+                        default_value -- see read_all_configuration_variables
+                        required -- see read_all_configuration_variables
+                        allowed_types -- see read_all_configuration_variables
+                        prefetched_files -- the config files checked (& parsed) ahead of the merge, see
+                            _prefetch_config_files
+                    Returns:
+                        config_value_dict -- a dict of the key/value pairs of all the configurations requested
+        """
+        # the merge is done under the index lock so a concurrent reload can't change the index half way through it
+        with self._index_lock:
+            # the index already holds the winning value of each key of the files & cli args so only the sources that
+            # changed since it was built are merged again, the index values are shared with the cache so we take a copy
+            self._refresh_index(prefetched_files)
+            config_value_dict = copy.deepcopy({
+                config_key: config_index_entry[3] for config_key, config_index_entry in self.config_index.items()
+                if self.config_key_divider is None or
+                config_key in self.indexed_sources[(config_index_entry[0], config_index_entry[2])][1]
+            })
+
+            # envvars are taken from the dict read alongside the envvars snapshot (see refresh_envvars) with the
+            # envvar_prefix removed (& nested if so desired) & take the place of any key of a lower priority source
+            if self.envvars_priority is not None:
+                if self.envvars_snapshot is None:
+                    self.refresh_envvars()
+                for envvar_key, envvar_value in self._declared_keys_dict(self.envvars_dict).items():
+                    config_index_entry = self.config_index.get(envvar_key)
+                    if config_index_entry is None or self.envvars_priority < config_index_entry[0]:
+                        config_value_dict[envvar_key] = copy.deepcopy(envvar_value)
+
+            self.skipped_config_files = []
+        return self._check_config_value_dict(config_value_dict, default_value, required, allowed_types)
+
+    def _check_config_value_dict(self, config_value_dict: dict, default_value: Optional[dict],
+                                 required: Optional[list], allowed_types: Optional[dict]) -> dict:
+        """internal function which adds the default values to the combined dict of the configuration variables, type
+                estimates it & checks the required keys & allowed types of it
 
+                    Arguments:
+                        config_value_dict -- the combined dict of the configuration variables found in the sources
+                        default_value -- see read_all_configuration_variables
+                        required -- see read_all_configuration_variables
+                        allowed_types -- see read_all_configuration_variables
+                    Returns:
+                        config_value_dict -- a dict of the key/value pairs of all the configurations requested
+        """
         # now we need to add the default values from the provided "default_value" dict to any configuration variable in
         # said list that wasn't found in any of the valid sources
         if default_value is not None:
@@ -338,7 +631,8 @@ class ParseIt:
 
         # and we run the type estimate (which is recursive) on the full dict if it's configured to be used
         if self.type_estimate is True:
-            config_value_dict = estimate_type(config_value_dict, none_values=self.none_values)
+            config_value_dict = estimate_type(config_value_dict, none_values=self.none_values,
+                                              type_estimate_cache=self.type_estimate_cache)
 
         # now we check that all the required values exist and raise a ValueError otherwise
         if required is not None:
@@ -378,6 +672,722 @@ class ParseIt:
             config_found = False
         return config_found, config_value
 
+    def read_configuration_variable_source(self, config_name: str) -> Tuple[Optional[str], Optional[str]]:
+        """returns where the value of a configuration key is taken from based on the priority of each config file
+                option given in the __init__ of the class
+
+                    Arguments:
+                        config_name -- the configuration key name you want to get the source of
+                    Returns:
+                        config_type -- the config type (cli_args, env_vars, json, yaml, etc...) the value is taken from,
+                            None if the configuration key is not found in any of them
+                        config_file -- the location of the config file the value is taken from, None if the value is
+                            not taken from a file
+        """
+        return self._read_configuration_variable_source(config_name, self._prefetch_config_files())
+
+    def _read_configuration_variable_source(self, config_name: str,
+                                            prefetched_files: dict) -> Tuple[Optional[str], Optional[str]]:
+        """internal function which does the work of read_configuration_variable_source once the config files are
+                checked (& parsed if so desired) ahead of the lookup
+
+                    Arguments:
+                        config_name -- see read_configuration_variable_source
+                        prefetched_files -- see _prefetch_config_files
+                    Returns:
+                        config_type -- see read_configuration_variable_source
+                        config_file -- see read_configuration_variable_source
+        """
+        config_index_entry = self._lookup_config_index(config_name, prefetched_files)
+        if config_index_entry is None:
+            return None, None
+        return config_index_entry[1], config_index_entry[2]
+
+    def snapshot(self) -> ConfigSnapshot:
+        """returns the published snapshot of the configuration, publishing it first if there is none, the snapshot is
+                an immutable mapping of all the configuration variables (the same as read_all_configuration_variables
+                returns) so it can be read from any number of threads without locking, reload publishes a new snapshot
+                whenever the config files changed & readers holding the previous one keep using it unchanged
+
+                    Returns:
+                        config_snapshot -- the published ConfigSnapshot of the configuration
+        """
+        # the published snapshot is swapped as a whole so reading the reference needs no lock
+        config_snapshot = self.config_snapshot
+        if config_snapshot is None:
+            config_snapshot = self.publish_snapshot()
+        return config_snapshot
+
+    def publish_snapshot(self) -> ConfigSnapshot:
+        """reads all the configuration variables & publishes a new snapshot of them in place of the previous one, the
+                values which didn't change since the previous snapshot are shared with it rather then copied, call it to
+                pick up changes reload doesn't look for (like the envvars or the cli args)
+
+                    Returns:
+                        config_snapshot -- the new published ConfigSnapshot of the configuration
+        """
+        with self._index_lock:
+            config_value_dict = self._read_all_configuration_variables(None, None, None, self._prefetch_config_files())
+            config_snapshot = freeze_config(config_value_dict, self.config_snapshot)
+            self.config_snapshot = config_snapshot
+        return config_snapshot
+
+    def rebuild_index(self):
+        """builds the merged config index of all the configuration sources, the index maps each key to a
+                (priority, config_type, config_file, value) tuple of the source with the highest priority that holds it,
+                alongside it the list of all the sources that hold each key is kept in priority order so when a single
+                source changes only it's keys are merged again, envvars are kept in a separate snapshot as their case
+                handling differs from the rest of the sources (& are read again as well), every read merges again
+                the config files that changed on disk so it's only needed to build the index from scratch
+        """
+        self._rebuild_index(self._prefetch_config_files(), refresh_envvars=True)
+
+    def _rebuild_index(self, prefetched_files: dict, refresh_envvars: bool = False):
+        """internal function which does the work of rebuild_index once the files that are to be parsed ahead of it are
+                parsed
+
+            Arguments:
+                prefetched_files -- the config files checked (& parsed) ahead of the index build, see
+                    _prefetch_config_files
+                refresh_envvars -- if set to True the envvars snapshot is read again, otherwise it's only read if
+                    there is none yet, defaults to False
+        """
+        with self._index_lock:
+            self.config_index = {}
+            self.config_key_sources = {}
+            self.indexed_sources = {}
+            self.envvars_priority = None
+            self.envvars_config_type = None
+
+            try:
+                for config_priority, config_type in enumerate(self.config_type_priority):
+                    if config_type == "cli_args":
+                        self._index_source(config_priority, config_type, None, -1,
+                                           self._declared_keys_dict(read_all_cli_args_to_dict()))
+                    elif config_type == "envvars" or config_type == "env_vars":
+                        if self.envvars_priority is None:
+                            self.envvars_priority = config_priority
+                            self.envvars_config_type = config_type
+                    elif config_type in self.valid_file_type_extension:
+                        for config_file_position, config_file in enumerate(self.config_files_dict[config_type]):
+                            file_dict = self._read_config_file(config_type, config_file, prefetched_files,
+                                                               skip_missing=True)
+                            if file_dict is not None:
+                                self._index_source(config_priority, config_type, self._config_file_path(config_file),
+                                                   config_file_position, file_dict)
+                    else:
+                        raise ValueError
+            except Exception:
+                self.config_index = None
+                raise
+
+            # the envvars are only read on the first build unless asked for, see refresh_envvars
+            if refresh_envvars is True or self.envvars_snapshot is None:
+                self.refresh_envvars()
+            self._update_compiled_cache()
+
+    def _refresh_index(self, prefetched_files: dict) -> set:
+        """internal function which merges again only the sources that changed since the index was built (a file that
+                was modified, added or removed or the cli args), building the index first if needed
+
+            Arguments:
+                prefetched_files -- the config files checked (& parsed) ahead of the merge, see
+                    _prefetch_config_files
+            Returns:
+                changed_keys -- a set of the keys whose winning source or value changed, empty if the index was built
+        """
+        with self._index_lock:
+            if self.config_index is None:
+                self._rebuild_index(prefetched_files)
+                return set()
+
+            changed_keys = set()
+            current_sources = set()
+            for config_priority, config_type in enumerate(self.config_type_priority):
+                if config_type == "cli_args":
+                    current_sources.add((config_priority, None))
+                    cli_args_dict = self._declared_keys_dict(read_all_cli_args_to_dict())
+                    if self.indexed_sources.get((config_priority, None), (None, {}))[1] != cli_args_dict:
+                        changed_keys |= self._index_source(config_priority, config_type, None, -1, cli_args_dict)
+                elif config_type in self.valid_file_type_extension:
+                    for config_file_position, config_file in enumerate(self.config_files_dict[config_type]):
+                        config_file_location = self._config_file_path(config_file)
+                        # an unchanged file is taken from the cache so it's the same dict that is already in the index,
+                        # a file is also merged again if a file added or removed before it in the list moved it & a
+                        # file which was deleted (a single config file isn't listed again) is removed from the index
+                        file_dict = self._read_config_file(config_type, config_file, prefetched_files,
+                                                           skip_missing=True)
+                        if file_dict is None:
+                            continue
+                        current_sources.add((config_priority, config_file_location))
+                        indexed_source = self.indexed_sources.get((config_priority, config_file_location))
+                        if indexed_source is None or indexed_source[1] is not file_dict or \
+                                indexed_source[3] != config_file_position:
+                            changed_keys |= self._index_source(config_priority, config_type, config_file_location,
+                                                               config_file_position, file_dict)
+
+            for config_priority, config_file_location in set(self.indexed_sources) - current_sources:
+                config_type = self.indexed_sources[(config_priority, config_file_location)][0]
+                changed_keys |= self._index_source(config_priority, config_type, config_file_location, None, None)
+
+            self._update_compiled_cache()
+            return changed_keys
+
+    def _index_source(self, config_priority: int, config_type: str, config_file_location: Optional[str],
+                      config_file_position: Optional[int], source_dict: Optional[dict]) -> set:
+        """internal function which merges a single source into the index, only the keys the source held the last time
+                it was merged or holds now are merged again
+
+            Arguments:
+                config_priority -- the priority of the source type
+                config_type -- the type of the source
+                config_file_location -- the location of the config file, None for the cli args
+                config_file_position -- the position of the config file in the config_files_dict list of it's type
+                    (-1 for the cli args), None if the source was removed
+                source_dict -- the dict of the source key/value pairs, None if the source was removed
+            Returns:
+                changed_keys -- a set of the keys whose winning source or value changed
+        """
+        source_key = (config_priority, config_file_location)
+        old_source_dict = self.indexed_sources.get(source_key, (None, None, {}))[2]
+        if source_dict is None:
+            self.indexed_sources.pop(source_key, None)
+            source_dict = {}
+        else:
+            # when config_key_divider is set the paths to all the nested values of the source are indexed as well so
+            # reading a nested value is a single lookup, the source dict itself is kept to know when it was replaced
+            indexed_source_dict = source_dict
+            if self.config_key_divider is not None:
+                source_dict = flatten_dict(source_dict, self.config_key_divider)
+            self.indexed_sources[source_key] = (config_type, indexed_source_dict, source_dict, config_file_position)
+
+        # the sources of each key are kept sorted by priority & then by the position of the file in the list of the
+        # files of it's type, which is the order the files are read in
+        source_sort_key = config_file_position
+        changed_keys = set()
+        if old_source_dict:
+            config_keys = old_source_dict.keys() | source_dict.keys()
+        else:
+            config_keys = source_dict.keys()
+        for config_key in config_keys:
+            key_sources = self.config_key_sources.get(config_key)
+            if key_sources is None:
+                # a key no other source holds is simply added, this is the common case when building the index
+                config_value = source_dict[config_key]
+                self.config_key_sources[config_key] = [(config_priority, source_sort_key, config_type,
+                                                        config_file_location, config_value)]
+                self.config_index[config_key] = (config_priority, config_type, config_file_location, config_value)
+                changed_keys.add(config_key)
+                continue
+
+            winning_key_source = key_sources[0]
+            if config_key in old_source_dict:
+                key_sources = [key_source for key_source in key_sources
+                               if key_source[0] != config_priority or key_source[3] != config_file_location]
+            if config_key in source_dict:
+                bisect.insort(key_sources, (config_priority, source_sort_key, config_type, config_file_location,
+                                            source_dict[config_key]))
+
+            if not key_sources:
+                del self.config_key_sources[config_key]
+                del self.config_index[config_key]
+                changed_keys.add(config_key)
+                continue
+            self.config_key_sources[config_key] = key_sources
+            # the key only needs to be merged again if the source with the highest priority that holds it changed
+            if key_sources[0] is winning_key_source:
+                continue
+            config_index_entry = (key_sources[0][0],) + key_sources[0][2:]
+            if config_index_entry != self.config_index[config_key]:
+                changed_keys.add(config_key)
+            self.config_index[config_key] = config_index_entry
+        return changed_keys
+
+    def reload(self) -> dict:
+        """checks the configuration files for changes & picks them up, only the known files & folders are checked (with
+                a stat call each), the folders are only scanned again if a file was added or removed from them & only
+                the files that changed (size, modification time or inode) are parsed again so it's cheap enough to call
+                every few seconds, envvars are not re-read, see refresh_envvars for that
+
+                    Returns:
+                        config_diff -- a dict of the changes found with the following keys:
+                            added_files -- a list of the locations of the config files that were added
+                            removed_files -- a list of the locations of the config files that were removed
+                            modified_files -- a list of the locations of the config files that changed
+                            changed_keys -- a list of the configuration keys whose value (or source) changed, only keys
+                                that were already read once are compared so it's empty on the first reload if nothing
+                                was read yet
+        """
+        with self._index_lock:
+            old_config_files = self._config_files_locations()
+
+            # a folder modification time changes when a file is added to or removed from it so they are only scanned
+            # again if one of them changed
+            if self.config_file_type is None and folder_exists(self.config_location) is True:
+                self.config_file_type = "folder"
+                self.folders_mtimes = {}
+            if self.config_file_type == "folder" and self._folders_unchanged(self.folders_mtimes) is False:
+                self.folders_mtimes = {}
+                self.config_files_dict = file_types_in_folder(self.config_location, self.valid_config_types,
+                                                              recurse=self.recurse, folders_mtimes=self.folders_mtimes)
+            new_config_files = self._config_files_locations()
+
+            added_files = sorted(new_config_files - old_config_files)
+            removed_files = sorted(old_config_files - new_config_files)
+            for config_file_location in removed_files:
+                self.parsed_files_cache.pop(os.path.abspath(config_file_location), None)
+
+            # a single config file is always listed so it's deletion (& return) is found by it's fingerprint
+            self.missing_config_files &= new_config_files
+            modified_files = []
+            for config_file_location in sorted(new_config_files & old_config_files):
+                cache_key = os.path.abspath(config_file_location)
+                cached_file = self.parsed_files_cache.get(cache_key)
+                file_fingerprint = self._config_file_fingerprint(config_file_location)
+                if file_fingerprint is None:
+                    if config_file_location not in self.missing_config_files:
+                        self.missing_config_files.add(config_file_location)
+                        self.parsed_files_cache.pop(cache_key, None)
+                        removed_files.append(config_file_location)
+                elif config_file_location in self.missing_config_files:
+                    self.missing_config_files.discard(config_file_location)
+                    added_files.append(config_file_location)
+                elif cached_file is not None and cached_file[0] != file_fingerprint:
+                    modified_files.append(config_file_location)
+            added_files.sort()
+            removed_files.sort()
+
+            changed_keys = []
+            if (added_files or removed_files or modified_files) and self.config_index is not None:
+                # only the added & modified files are parsed & only their keys (& the keys of the removed files) are
+                # merged
+                changed_keys = sorted(self._refresh_index(self._prefetch_config_files()))
+
+            # a published snapshot is replaced by one of the new configuration, readers holding the old one keep it
+            if (added_files or removed_files or modified_files) and self.config_snapshot is not None:
+                self.publish_snapshot()
+
+            return {
+                "added_files": added_files,
+                "removed_files": removed_files,
+                "modified_files": modified_files,
+                "changed_keys": changed_keys
+            }
+
+    def write_compiled_cache(self):
+        """writes the parsed config files (alongside their size, modification time & hash) & the list of config files
+                to the compiled_cache_location so the next parse_it object with the same configuration can take them
+                from it rather then parse them, this is done automatically whenever config files are parsed so it's
+                only needed when the compiled cache file was removed, files with values that can't be written (for
+                example the dates yaml & toml files can have) are left out
+        """
+        with self._index_lock:
+            if self.compiled_cache_location is None:
+                raise ValueError
+
+            compiled_files = {}
+            compiled_files_hashes = {}
+            for config_file_location in self._config_files_locations():
+                cache_key = os.path.abspath(config_file_location)
+                cached_file = self.parsed_files_cache.get(cache_key)
+                if cached_file is None:
+                    continue
+                compiled_file_hash = self.compiled_files_hashes.get(cache_key)
+                if compiled_file_hash is not None and compiled_file_hash[0] == cached_file[0] and \
+                        compiled_file_hash[1] is cached_file[1]:
+                    # the file wasn't parsed again since the last write so it's hash is still valid
+                    file_hash = compiled_file_hash[2]
+                elif can_be_compiled(cached_file[1]) is False:
+                    file_hash = None
+                else:
+                    file_hash = file_sha256(config_file_location)
+                    # a file that changed since it was parsed (even while it's being hashed) is left out
+                    if file_hash is None or self._config_file_fingerprint(config_file_location) != cached_file[0]:
+                        continue
+                compiled_files_hashes[cache_key] = (cached_file[0], cached_file[1], file_hash)
+                if file_hash is not None:
+                    compiled_files[cache_key] = (cached_file[0][0], cached_file[0][1], file_hash, cached_file[1])
+
+            write_compiled_cache(self.compiled_cache_location, {
+                "config_location": os.path.abspath(self.config_location),
+                "recurse": self.recurse,
+                "valid_config_types": self.valid_config_types,
+                "suffix_file_types": self.suffix_file_types,
+                "declared_keys": None if self.declared_keys is None else sorted(self.declared_keys),
+                "folders_mtimes": self.folders_mtimes,
+                "config_files_dict": self.config_files_dict,
+                "files": compiled_files
+            })
+            self.compiled_files_hashes = compiled_files_hashes
+
+    def refresh_envvars(self):
+        """re-reads the envvars snapshot from the environment, envvars are read once (filtered by the envvar_prefix,
+                in UPPERCASE if force_envvars_uppercase is set & already decoded) & all envvar lookups are served from
+                said snapshot, alongside it the dict of all the envvars read_all_configuration_variables merges (nested
+                if envvar_divider is set) is kept as well, call it if the environment of the process changed after the
+                first read, it's the only way envvars are re-read by all the read functions, the config files are not
+                re-read
+        """
+        with self._index_lock:
+            if "envvars" not in self.config_type_priority and "env_vars" not in self.config_type_priority:
+                self.envvars_snapshot = {}
+                self.envvars_dict = {}
+                return
+            # the environment is copied once so both forms of the envvars are read from the same point in time
+            environ = dict(os.environ.items())
+            self.envvars_snapshot = read_envvars_snapshot(envvar_prefix=self.envvar_prefix,
+                                                          force_uppercase=self.force_envvars_uppercase, environ=environ)
+            if self.nest_envvars is True:
+                self.envvars_dict = split_envvar_combained_dict(divider=self.envvar_divider,
+                                                                force_uppercase=self.force_envvars_uppercase,
+                                                                envvar_prefix=self.envvar_prefix, environ=environ)
+            else:
+                self.envvars_dict = read_all_envvars_to_dict(force_uppercase=self.force_envvars_uppercase,
+                                                             envvar_prefix=self.envvar_prefix, environ=environ)
+
+    def invalidate(self, config_file: str):
+        """removes a single config file from the parsed files cache so it will be re-parsed on the next read, only the
+                keys of said file are merged into the index again
+
+            Arguments:
+                config_file -- the location of the config file, either as listed in config_files_dict or as a full path
+        """
+        with self._index_lock:
+            self.parsed_files_cache.pop(os.path.abspath(self._config_file_path(config_file)), None)
+
+    def clear_cache(self):
+        """removes all config files from the parsed files cache & resets the cache hits/misses counters, the index is
+                built from scratch on the next read (the envvars snapshot is kept, see refresh_envvars)
+        """
+        with self._index_lock:
+            self.parsed_files_cache = {}
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.config_index = None
+
+    def _lookup_config_index(self, config_name: str, prefetched_files: Optional[dict] = None) -> Optional[tuple]:
+        """internal function which returns the merged config index entry of the source with the highest priority that
+                holds the configuration key, building the index first if needed
+
+            Arguments:
+                config_name -- the configuration key name you want to find
+                prefetched_files -- the config files checked (& parsed if so desired) ahead of the lookup, see
+                    _prefetch_config_files, if set the config files that changed on disk (& the cli args) are merged
+                    again before the lookup same as read_all_configuration_variables does, if set to None (default)
+                    the index is used as is
+            Returns:
+                config_index_entry -- a (priority, config_type, config_file, value) tuple, None if the configuration
+                    key is not found in any of the sources
+        """
+        with self._index_lock:
+            # every read picks up the config files that changed on disk (a stat call per file) so all the read
+            # functions agree on the values
+            if self.config_index is None:
+                self._rebuild_index(prefetched_files or {})
+            elif prefetched_files is not None:
+                self._refresh_index(prefetched_files)
+
+            # keys that weren't declared are not kept from any of the sources
+            if self._is_declared_key(config_name) is False:
+                return None
+
+            config_index_entry = self.config_index.get(config_name)
+            if self.envvars_snapshot:
+                envvar_key = self._envvar_key(config_name)
+                if envvar_key in self.envvars_snapshot and (config_index_entry is None or
+                                                            self.envvars_priority < config_index_entry[0]):
+                    config_index_entry = (self.envvars_priority, self.envvars_config_type, None,
+                                          self.envvars_snapshot[envvar_key])
+            return config_index_entry
+
+    def _read_compiled_cache(self) -> Optional[dict]:
+        """internal function which reads the compiled cache if there is one which was written by a parse_it object with
+                the same config_location, recurse flag, config types, mapping of file suffixes to file types &
+                declared keys
+
+            Returns:
+                compiled_cache -- the dict the compiled cache was written from, None if it can't be used
+        """
+        if self.compiled_cache_location is None:
+            return None
+        compiled_cache = read_compiled_cache(self.compiled_cache_location)
+        if compiled_cache is None or compiled_cache.get("config_location") != os.path.abspath(self.config_location) \
+                or compiled_cache.get("recurse") != self.recurse or \
+                compiled_cache.get("valid_config_types") != self.valid_config_types or \
+                compiled_cache.get("suffix_file_types") != self.suffix_file_types or \
+                compiled_cache.get("declared_keys") != (None if self.declared_keys is None else
+                                                        sorted(self.declared_keys)):
+            return None
+        return compiled_cache
+
+    def _load_compiled_files(self, compiled_files: dict):
+        """internal function which adds the config files in the compiled cache to the parsed files cache, a file is
+                only taken from it if it's size & modification time or hash didn't change
+
+            Arguments:
+                compiled_files -- a dict of a (size, mtime, hash, file_dict) tuple of each file keyed by it's absolute
+                    path
+        """
+        for config_file_location in self._config_files_locations():
+            cache_key = os.path.abspath(config_file_location)
+            compiled_file = compiled_files.get(cache_key)
+            if compiled_file is None:
+                continue
+            file_size, file_mtime, file_hash, file_dict = compiled_file
+            file_fingerprint = self._config_file_fingerprint(config_file_location)
+            if file_fingerprint is None or file_fingerprint[0] != file_size:
+                continue
+            # a file with a new modification time (a copy of the config folder for example) is checked by it's hash
+            if file_fingerprint[1] != file_mtime and file_sha256(config_file_location) != file_hash:
+                continue
+            self.parsed_files_cache[cache_key] = (file_fingerprint, file_dict)
+            self.compiled_files_hashes[cache_key] = (file_fingerprint, file_dict, file_hash)
+
+    def _update_compiled_cache(self):
+        """internal function which writes the compiled cache if any config file was parsed since it was last written,
+                including the files parsed ahead of the merge (in parallel or by AsyncParseIt)
+        """
+        if self.compiled_cache_location is None or self.compiled_cache_outdated is False:
+            return
+        self.compiled_cache_outdated = False
+        try:
+            self.write_compiled_cache()
+        except OSError as e:
+            warnings.warn("failed to write the compiled cache " + self.compiled_cache_location + ": " + str(e))
+
+    @staticmethod
+    def _folders_unchanged(folders_mtimes: dict) -> bool:
+        """internal function which checks if the folders were scanned with their current modification time
+
+            Arguments:
+                folders_mtimes -- a dict of the modification time of each folder scanned keyed by it's path
+            Returns:
+                True if none of the folders changed, False otherwise
+        """
+        if not folders_mtimes:
+            return False
+        for folder_path, folder_mtime in folders_mtimes.items():
+            try:
+                if os.stat(folder_path).st_mtime_ns != folder_mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _envvar_key(self, config_name: str) -> str:
+        """internal function which returns the name of the envvar in the envvars snapshot a configuration key is read
+                from
+
+            Arguments:
+                config_name -- the configuration key name
+            Returns:
+                envvar_key -- the name of the envvar with the envvar_prefix removed
+        """
+        envvar_key = config_name
+        if self.nest_envvars is True and self._is_config_path(config_name):
+            envvar_key = envvar_key.replace(self.config_key_divider, self.envvar_divider)
+        if self.force_envvars_uppercase is True:
+            envvar_key = envvar_key.upper()
+        return envvar_key
+
+    def _is_declared_key(self, config_name: str) -> bool:
+        """internal function which checks if a configuration key is kept from the sources
+
+            Arguments:
+                config_name -- the configuration key name
+            Returns:
+                True if declared_keys isn't set or the key (or the top level key of it's path) is in it, False
+                    otherwise
+        """
+        if self.declared_keys is None or config_name in self.declared_keys:
+            return True
+        return self._is_config_path(config_name) and \
+            config_name.split(self.config_key_divider, 1)[0] in self.declared_keys
+
+    def _declared_keys_dict(self, source_dict: dict) -> dict:
+        """internal function which returns only the declared keys of a source dict
+
+            Arguments:
+                source_dict -- the dict of the source key/value pairs
+            Returns:
+                source_dict -- the dict of the declared keys of the source, the same dict if declared_keys isn't set
+        """
+        if self.declared_keys is None:
+            return source_dict
+        return {config_key: config_value for config_key, config_value in source_dict.items()
+                if config_key in self.declared_keys}
+
+    def _is_config_path(self, config_name: str) -> bool:
+        """internal function which checks if a configuration key name is a path to a nested configuration value
+
+            Arguments:
+                config_name -- the configuration key name
+            Returns:
+                True if config_key_divider is set & the name has it, False otherwise
+        """
+        return self.config_key_divider is not None and self.config_key_divider in config_name
+
+    def _config_files_locations(self) -> set:
+        """internal function which returns the locations of all the config files in config_files_dict
+
+            Returns:
+                config_files_locations -- a set of the locations of all the config files
+        """
+        config_files_locations = set()
+        for config_files in self.config_files_dict.values():
+            for config_file in config_files:
+                config_files_locations.add(self._config_file_path(config_file))
+        return config_files_locations
+
+    def _config_file_path(self, config_file: str) -> str:
+        """internal function which returns the path of a config file as listed in config_files_dict
+
+            Arguments:
+                config_file -- the config file as listed in config_files_dict
+            Returns:
+                config_file_path -- the path of the config file
+        """
+        if self.config_file_type == "file":
+            return config_file
+        return os.path.join(self.config_location, config_file)
+
+    def _read_config_file(self, config_file_type: str, config_file: str, prefetched_files: Optional[dict] = None,
+                          skip_missing: bool = False) -> Optional[dict]:
+        """internal function which returns the parsed dict of a config file, using the parsed files cache if the file
+                didn't change since it was last parsed
+
+            Arguments:
+                config_file_type -- the type of the config file
+                config_file -- the config file as listed in config_files_dict
+                prefetched_files -- an optional dict of the files checked by _prefetch_config_files keyed by their
+                    absolute path, the files parsed ahead are returned as is & the fingerprint of the rest is taken
+                    from it rather then from a stat call of their own
+                skip_missing -- if set to True a file which doesn't exist (anymore) is not parsed & None is returned,
+                    defaults to False
+            Returns:
+                file_dict -- a parsed dict of the config file data, should not be changed as it's shared with the cache
+        """
+        config_file_location = self._config_file_path(config_file)
+        cache_key = os.path.abspath(config_file_location)
+        prefetched_file = prefetched_files.get(cache_key) if prefetched_files else None
+        if prefetched_file is None:
+            file_fingerprint = self._config_file_fingerprint(config_file_location)
+        elif prefetched_file[1] is not None:
+            return prefetched_file[1]
+        else:
+            file_fingerprint = prefetched_file[0]
+        if file_fingerprint is None and skip_missing is True:
+            self.parsed_files_cache.pop(cache_key, None)
+            return None
+        cached_file = self.parsed_files_cache.get(cache_key)
+        if file_fingerprint is not None and cached_file is not None and cached_file[0] == file_fingerprint:
+            self.cache_hits += 1
+            return cached_file[1]
+
+        self.cache_misses += 1
+        self.compiled_cache_outdated = True
+        file_dict = self._parse_file_per_type(config_file_type, config_file_location)
+        if file_fingerprint is not None:
+            self.parsed_files_cache[cache_key] = (file_fingerprint, file_dict)
+        return file_dict
+
+    def _prefetch_config_files(self) -> dict:
+        """internal function which parses all the config files that aren't in the parsed files cache (or changed since
+                they were cached) in parallel if parallel_parsing is set & there are enough of them to be worth it
+
+            Returns:
+                prefetched_files -- a dict of a (fingerprint, file_dict) tuple of each config file checked keyed by it's
+                    absolute path, file_dict is None for a file that wasn't parsed ahead, the fingerprints are used by
+                    the merge so each file is only checked once on each read, empty if parallel_parsing isn't set so
+                    the files are checked by the merge itself
+        """
+        if self.parallel_parsing is None:
+            return {}
+
+        file_fingerprints = {}
+        files_to_parse = self._config_files_to_parse(file_fingerprints)
+        files_to_parse_size = sum(file_fingerprint[0] for file_fingerprint, _, _ in files_to_parse.values())
+        if len(files_to_parse) < PARALLEL_PARSING_MIN_FILES or files_to_parse_size < PARALLEL_PARSING_MIN_BYTES:
+            return self._cache_parsed_files({}, [], file_fingerprints)
+
+        if self.parallel_parsing == "processes":
+            parsing_executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            parsing_executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+
+        with parsing_executor:
+            parsing_futures = [
+                parsing_executor.submit(load_file_parser(file_type, self.declared_keys), config_file_location)
+                for _, file_type, config_file_location in files_to_parse.values()
+            ]
+            # results are collected in the order the files were submitted so the outcome is deterministic
+            file_dicts = [parsing_future.result() for parsing_future in parsing_futures]
+        return self._cache_parsed_files(files_to_parse, file_dicts, file_fingerprints)
+
+    def _config_files_to_parse(self, file_fingerprints: Optional[dict] = None) -> dict:
+        """internal function which returns all the config files that aren't in the parsed files cache (or changed since
+                they were cached), missing files are left out to be handled by _read_config_file
+
+            Arguments:
+                file_fingerprints -- an optional dict which is filled with the fingerprint of each config file checked
+                    keyed by it's absolute path
+            Returns:
+                files_to_parse -- a dict of a (fingerprint, file_type, location) tuple of each file keyed by it's
+                    absolute path in the priority order of the files
+        """
+        files_to_parse = {}
+        for config_type in self.config_type_priority:
+            if config_type not in self.valid_file_type_extension:
+                continue
+            file_type = self.suffix_file_types.get(config_type)
+            for config_file in self.config_files_dict[config_type]:
+                config_file_location = self._config_file_path(config_file)
+                cache_key = os.path.abspath(config_file_location)
+                file_fingerprint = self._config_file_fingerprint(config_file_location)
+                if file_fingerprints is not None and file_fingerprint is not None:
+                    file_fingerprints[cache_key] = file_fingerprint
+                cached_file = self.parsed_files_cache.get(cache_key)
+                if file_type is None or file_fingerprint is None or cache_key in files_to_parse or \
+                        (cached_file is not None and cached_file[0] == file_fingerprint):
+                    continue
+                files_to_parse[cache_key] = (file_fingerprint, file_type, config_file_location)
+        return files_to_parse
+
+    def _cache_parsed_files(self, files_to_parse: dict, file_dicts: list, file_fingerprints: dict) -> dict:
+        """internal function which stores the files parsed ahead of a merge in the parsed files cache
+
+            Arguments:
+                files_to_parse -- the dict returned by _config_files_to_parse
+                file_dicts -- the parsed dict of each of the files in files_to_parse in the same order
+                file_fingerprints -- the fingerprint of each of the config files checked by _config_files_to_parse
+            Returns:
+                prefetched_files -- see _prefetch_config_files
+        """
+        with self._index_lock:
+            prefetched_files = {cache_key: (file_fingerprint, None)
+                                for cache_key, file_fingerprint in file_fingerprints.items()}
+            for (cache_key, (file_fingerprint, _, _)), file_dict in zip(files_to_parse.items(), file_dicts):
+                self.cache_misses += 1
+                self.compiled_cache_outdated = True
+                self.parsed_files_cache[cache_key] = (file_fingerprint, file_dict)
+                prefetched_files[cache_key] = (file_fingerprint, file_dict)
+            return prefetched_files
+
+    @staticmethod
+    def _config_file_fingerprint(config_file_location: str) -> Optional[tuple]:
+        """internal function which returns the fingerprint a cached parsed file is checked against
+
+            Arguments:
+                config_file_location -- the location of the config file
+            Returns:
+                file_fingerprint -- a (size, mtime, inode) tuple of the file, None if the file doesn't exist
+        """
+        try:
+            file_stat = os.stat(config_file_location)
+        except FileNotFoundError:
+            return None
+        return file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino
+
     def _parse_file_per_type(self, config_file_type: str, config_file_location: str) -> dict:
         """internal function which parses a file to a dict when given the file format type and it's location
 
@@ -388,20 +1398,7 @@ class ParseIt:
                 file_dict -- a parsed dict of the config file data
         """
 
-        if config_file_type in self.suffix_file_type_mapping["json"]:
-            file_dict = parse_json_file(config_file_location)
-        elif config_file_type in self.suffix_file_type_mapping["yaml"]:
-            file_dict = parse_yaml_file(config_file_location)
-        elif config_file_type in self.suffix_file_type_mapping["toml"]:
-            file_dict = parse_toml_file(config_file_location)
-        elif config_file_type in self.suffix_file_type_mapping["ini"]:
-            file_dict = parse_ini_file(config_file_location)
-        elif config_file_type in self.suffix_file_type_mapping["hcl"]:
-            file_dict = parse_hcl_file(config_file_location)
-        elif config_file_type in self.suffix_file_type_mapping["xml"]:
-            file_dict = parse_xml_file(config_file_location)
-        elif config_file_type in self.suffix_file_type_mapping["env"]:
-            file_dict = parse_env_file(config_file_location)
-        else:
+        file_type = self.suffix_file_types.get(config_file_type)
+        if file_type is None:
             raise ValueError
-        return file_dict
+        return load_file_parser(file_type, self.declared_keys)(config_file_location)
@@ -0,0 +1,142 @@
+from collections.abc import Mapping
+from typing import Any, Iterator, Optional
+
+
+# marks that there is no value of a previous snapshot to share
+NO_SHARED_VALUE = object()
+
+
+def freeze_value(value: Any, shared_value: Any = NO_SHARED_VALUE) -> Any:
+    """Return an immutable version of a configuration value, dicts become ConfigSnapshot objects, lists & tuples become
+        tuples & sets become frozensets (recursively), if the value is equal to the shared value (a value of a previous
+        snapshot) the shared value itself is returned so unchanged parts of the configuration are never copied
+
+            Arguments:
+                value -- the configuration value to freeze
+                shared_value -- the frozen value of the same configuration in a previous snapshot, if there is one
+            Returns:
+                frozen_value -- the immutable version of the value, the shared value if they are equal
+    """
+    if isinstance(value, dict):
+        return freeze_config(value, shared_value if isinstance(shared_value, ConfigSnapshot) else None)
+
+    if isinstance(value, (list, tuple)):
+        if not isinstance(shared_value, tuple) or len(shared_value) != len(value):
+            shared_value = None
+        frozen_value = tuple(
+            freeze_value(item, NO_SHARED_VALUE if shared_value is None else shared_value[item_number])
+            for item_number, item in enumerate(value)
+        )
+        if shared_value is not None and all(frozen_item is shared_item
+                                            for frozen_item, shared_item in zip(frozen_value, shared_value)):
+            return shared_value
+        return frozen_value
+
+    if isinstance(value, set):
+        value = frozenset(value)
+
+    # the type is checked as well so 1, 1.0 & True aren't mixed up
+    if shared_value is not NO_SHARED_VALUE and type(shared_value) is type(value) and shared_value == value:
+        return shared_value
+    return value
+
+
+def freeze_config(config_dict: dict, previous_snapshot: Optional["ConfigSnapshot"] = None) -> "ConfigSnapshot":
+    """Return an immutable snapshot of a configuration dict, every value that didn't change since the previous snapshot
+        (at any level of nesting) is shared with it rather then copied & if nothing changed the previous snapshot itself
+        is returned
+
+            Arguments:
+                config_dict -- the configuration dict to freeze
+                previous_snapshot -- an optional snapshot of a previous version of the configuration to share the
+                    unchanged values with
+            Returns:
+                config_snapshot -- the immutable snapshot of the configuration dict
+    """
+    if previous_snapshot is None:
+        return ConfigSnapshot(config_dict)
+
+    frozen_config_dict = {}
+    for config_key, config_value in config_dict.items():
+        frozen_config_dict[config_key] = freeze_value(config_value, previous_snapshot.get(config_key, NO_SHARED_VALUE))
+    if len(frozen_config_dict) == len(previous_snapshot) and \
+            all(config_key in previous_snapshot and previous_snapshot[config_key] is frozen_config_value
+                for config_key, frozen_config_value in frozen_config_dict.items()):
+        return previous_snapshot
+    return ConfigSnapshot._from_frozen_dict(frozen_config_dict)
+
+
+class ConfigSnapshot(Mapping):
+
+    __slots__ = ("_config_dict",)
+
+    def __init__(self, config_dict: Optional[dict] = None):
+        """an immutable (& therefore safe to read from any number of threads without locking) mapping of configuration
+                keys to their values, nested dicts are ConfigSnapshot objects as well, lists are tuples & sets are
+                frozensets, use to_dict to get a regular (mutable) dict of it
+
+                    Arguments:
+                        config_dict -- the configuration dict to take the snapshot of, defaults to an empty snapshot
+        """
+        object.__setattr__(self, "_config_dict", {
+            config_key: freeze_value(config_value) for config_key, config_value in (config_dict or {}).items()
+        })
+
+    @classmethod
+    def _from_frozen_dict(cls, frozen_config_dict: dict) -> "ConfigSnapshot":
+        """internal function which creates a snapshot from a dict that all of it's values are already frozen
+
+            Arguments:
+                frozen_config_dict -- the dict of the frozen configuration values, it must not be changed afterwards
+            Returns:
+                config_snapshot -- the snapshot of the dict
+        """
+        config_snapshot = cls.__new__(cls)
+        object.__setattr__(config_snapshot, "_config_dict", frozen_config_dict)
+        return config_snapshot
+
+    def __getitem__(self, config_key: Any) -> Any:
+        return self._config_dict[config_key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._config_dict)
+
+    def __len__(self) -> int:
+        return len(self._config_dict)
+
+    def __contains__(self, config_key: Any) -> bool:
+        return config_key in self._config_dict
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("ConfigSnapshot is immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError("ConfigSnapshot is immutable")
+
+    def __repr__(self) -> str:
+        return "ConfigSnapshot(" + repr(self._config_dict) + ")"
+
+    def to_dict(self) -> dict:
+        """returns a regular (mutable) copy of the snapshot, nested snapshots become dicts & tuples become lists
+
+                    Returns:
+                        config_dict -- a dict of the configuration key/value pairs of the snapshot
+        """
+        return {config_key: thaw_value(config_value) for config_key, config_value in self._config_dict.items()}
+
+
+def thaw_value(value: Any) -> Any:
+    """Return a mutable copy of a frozen configuration value, see freeze_value
+
+            Arguments:
+                value -- the frozen configuration value
+            Returns:
+                thawed_value -- the mutable version of the value
+    """
+    if isinstance(value, ConfigSnapshot):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [thaw_value(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
@@ -1,16 +1,40 @@
 import ast
-from typing import Any
+import re
+import copy
+import functools
+from typing import Any, Optional
 from contextlib import suppress
 
 
-def estimate_type(node: Any, none_values=None) -> Any:
+# the patterns of decimal int & float literals, strings fully matching them are converted without ast.literal_eval
+INT_PATTERN = re.compile(r"[+-]?(?:[1-9][0-9]*|0+)")
+FLOAT_PATTERN = re.compile(r"[+-]?(?:(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|[0-9]+[eE][+-]?[0-9]+)")
+
+# strings made only of digits & dots with more then one dot (IPs, versions) are never a python literal
+DOTTED_NUMBERS_PATTERN = re.compile(r"[0-9]*\.[0-9]*\.[0-9.]*")
+
+# the name a string starts with, strings starting with any name other then the ones in LITERAL_NAMES or a string
+# prefix followed by a quote are never a python literal
+LEADING_NAME_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+LITERAL_NAMES = {"True", "False", "None", "set"}
+STRING_PREFIXES = {"r", "u", "b", "f", "br", "rb", "fr", "rf"}
+
+# the characters a python literal (or the whitespace & comments before it) can start with other then a name
+LITERAL_START_CHARACTERS = set("0123456789.+-'\"([{#\\ \t\n\r\f\v")
+
+
+def estimate_type(node: Any, none_values=None, type_estimate_cache: Optional["TypeEstimateCache"] = None) -> Any:
     """ Takes any type and return it's value in a type it estimates it to be based on ast.literal_eval & internal logic,
-    if the result is a list or a dict will recurse to run all internal values as well, in case of problems parsing the
-    string with ast.literal_eval it will fallback to sticking with the original type
+    if the result is a list or a dict will recurse to run all internal values as well, if given a dict will recurse to
+    run all of it's values, in case of problems parsing the string with ast.literal_eval it will fallback to sticking
+    with the original type, common values (ints, floats, booleans, none values & plain strings) are estimated without
+    ast.literal_eval
      
             Arguments:
                 node -- the string a type estimation is needed for
                 none_values -- the values that should be converted to `None`
+                type_estimate_cache -- an optional TypeEstimateCache to remember the estimation of strings in, if set to
+                    None (default) strings will be estimated every time
             Returns:
                 node -- the value of the string in the estimated type
 
@@ -19,27 +43,132 @@ def estimate_type(node: Any, none_values=None) -> Any:
     if none_values is None:
         none_values = {"", "null", "none"}
 
-    # this is to support XML type estimation as it returns a dict of all strings
+    # this is to support XML type estimation as it returns a dict of all strings, each value is estimated in place
+    # rather then turning the whole dict to a string & parsing it back
     if isinstance(node, dict):
-        node = str(node)
+        return {
+            key: estimate_type(value, none_values=none_values, type_estimate_cache=type_estimate_cache)
+            for key, value in node.items()
+        }
+
+    # a list is estimated item by item as well, this is how the values of a cli arg given multiple times are estimated
+    # the same way the value of a cli arg given once is
+    if isinstance(node, list):
+        return [estimate_type(item, none_values=none_values, type_estimate_cache=type_estimate_cache) for item in node]
 
     if isinstance(node, str):
-        if node.lower() in {"true", "false"}:
-            node = node.title()
-        elif node.lower() in none_values:
-            node = "None"
-
-        with suppress(ValueError, SyntaxError):
-            node = ast.literal_eval(node)
-            if isinstance(node, list):
-                node = [
-                    estimate_type(item, none_values=none_values)
-                    for item in node
-                ]
-            if isinstance(node, dict):
-                node = {
-                    key: estimate_type(value, none_values=none_values)
-                    for key, value in node.items()
-                }
+        if type_estimate_cache is not None:
+            return type_estimate_cache.estimate_string_type(node, none_values)
+        return estimate_string_type(node, none_values)
 
     return node
+
+
+def estimate_string_type(node: str, none_values) -> Any:
+    """ Takes a string and return it's value in a type it estimates it to be, see estimate_type for how it's done
+
+            Arguments:
+                node -- the string a type estimation is needed for
+                none_values -- the values that should be converted to `None`
+            Returns:
+                node -- the value of the string in the estimated type
+
+    """
+    node_lowercase = node.lower()
+    if node_lowercase == "true":
+        return True
+    elif node_lowercase == "false":
+        return False
+    elif node_lowercase in none_values:
+        return None
+
+    with suppress(ValueError):
+        if INT_PATTERN.fullmatch(node) is not None:
+            return int(node)
+        elif FLOAT_PATTERN.fullmatch(node) is not None:
+            return float(node)
+
+    if is_plain_string(node) is True:
+        return node
+
+    with suppress(ValueError, SyntaxError):
+        node = ast.literal_eval(node)
+        if isinstance(node, list):
+            node = [
+                estimate_type(item, none_values=none_values)
+                for item in node
+            ]
+        if isinstance(node, dict):
+            node = {
+                key: estimate_type(value, none_values=none_values)
+                for key, value in node.items()
+            }
+
+    return node
+
+
+def is_plain_string(node: str) -> bool:
+    """ Checks if a string can't possibly be a python literal without parsing it with ast.literal_eval, a False reply
+    means it might be a python literal & needs to be parsed to know for sure
+
+            Arguments:
+                node -- the string to check
+            Returns:
+                True if the string is never a python literal, False otherwise
+
+    """
+    if node[:1] in LITERAL_START_CHARACTERS:
+        return node[:1].isdigit() and DOTTED_NUMBERS_PATTERN.fullmatch(node) is not None
+
+    leading_name = LEADING_NAME_PATTERN.match(node)
+    if leading_name is None:
+        return True
+    leading_name = leading_name.group()
+    if leading_name in LITERAL_NAMES:
+        return False
+    return not (leading_name.lower() in STRING_PREFIXES and node[len(leading_name):len(leading_name) + 1] in {"'", '"'})
+
+
+class TypeEstimateCache:
+
+    def __init__(self, maxsize: int = 1024):
+        """a bounded LRU cache of the type estimation of strings, each string is only estimated once for each set of
+                none_values until it's pushed out of the cache by newer strings
+
+                    Arguments:
+                        maxsize -- the maximum number of estimated strings kept in the cache, defaults to 1024
+        """
+        self.maxsize = maxsize
+        # the none_values are part of the cache key so they are passed to it as a frozenset
+        self._cached_estimate_string_type = functools.lru_cache(maxsize=maxsize)(estimate_string_type)
+
+    def estimate_string_type(self, node: str, none_values) -> Any:
+        """returns the estimated type of the string from the cache (estimating it if it's not already cached), lists,
+                dicts, sets & tuples are returned as a copy so changing them will not change the cache
+
+                    Arguments:
+                        node -- the string a type estimation is needed for
+                        none_values -- the values that should be converted to `None`
+                    Returns:
+                        node -- the value of the string in the estimated type
+        """
+        if not isinstance(none_values, frozenset):
+            none_values = frozenset(none_values)
+        node = self._cached_estimate_string_type(node, none_values)
+        if isinstance(node, (list, dict, set, tuple)):
+            node = copy.deepcopy(node)
+        return node
+
+    def cache_info(self) -> tuple:
+        """returns the hits, misses, maxsize & currsize of the cache
+
+                    Returns:
+                        cache_info -- a named tuple of the cache hits, misses, maxsize & currsize
+        """
+        return self._cached_estimate_string_type.cache_info()
+
+    def cache_clear(self):
+        """removes all the strings from the cache & resets it's stats
+        """
+        self._cached_estimate_string_type.cache_clear()
+
@@ -0,0 +1,234 @@
+from parse_it.parser import ParseIt
+from typing import Callable, Optional
+import threading
+import warnings
+import select
+import ctypes
+import errno
+import sys
+import os
+
+
+# the inotify events that can mean a config file or folder changed, see inotify(7) for their meaning
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+INOTIFY_WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | \
+                     IN_DELETE_SELF | IN_MOVE_SELF
+
+# how often (in seconds) the watcher thread checks if it was asked to stop while waiting for inotify events
+STOP_CHECK_INTERVAL = 0.2
+
+
+def inotify_libc() -> Optional[ctypes.CDLL]:
+    """Returns the libc the inotify functions are called from, None if inotify isn't available (not Linux or a libc
+        without inotify)
+
+        Returns:
+            libc -- the libc of the process, None if inotify isn't available
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class ConfigWatcher:
+
+    def __init__(self, parser: ParseIt, callbacks: Optional[list] = None, debounce: float = 0.5,
+                 poll_interval: float = 2.0, use_inotify: bool = True):
+        """watches the config files of a parse_it object in a background thread & reloads it (see ParseIt.reload) when
+                they change, on Linux inotify is used to know when the config folder (& all of it's subfolders if the
+                parse_it object recurse flag is set) changed & when inotify isn't available the files are checked every
+                poll_interval seconds, note that the callbacks are called from the watcher thread
+
+                    Arguments:
+                        parser -- the parse_it object to watch the config files of
+                        callbacks -- a list of functions which will be called with the dict returned by
+                            ParseIt.reload (which includes the changed_keys) every time the config files changed
+                        debounce -- the number of seconds without any new inotify events to wait for before reloading,
+                            so a burst of changes (like a kubernetes ConfigMap symlinks swap) causes a single reload,
+                            defaults to 0.5
+                        poll_interval -- the number of seconds between each check of the config files when inotify
+                            isn't used, defaults to 2.0
+                        use_inotify -- if set to False the config files will be polled even if inotify is available,
+                            defaults to True
+        """
+        self.parser = parser
+        self.callbacks = list(callbacks) if callbacks is not None else []
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.using_inotify = False
+        self._libc = None
+        self._inotify_fd = None
+        self._stop_event = threading.Event()
+        self._watcher_thread = None
+
+    def add_callback(self, callback: Callable[[dict], None]):
+        """adds a function which will be called with the dict returned by ParseIt.reload every time the config files
+                changed
+
+                    Arguments:
+                        callback -- the function to call
+        """
+        self.callbacks.append(callback)
+
+    def start(self):
+        """starts watching the config files in a background thread, does nothing if it's already watching
+        """
+        if self._watcher_thread is not None and self._watcher_thread.is_alive():
+            return
+
+        # the index is built first so the changed keys of the first change can be found, the sync rebuild_index is
+        # called explicitly as AsyncParseIt overrides it with a coroutine (the watcher thread reloads it synchronously)
+        if self.parser.config_index is None:
+            ParseIt.rebuild_index(self.parser)
+
+        self._stop_event.clear()
+        self.using_inotify = self.use_inotify is True and self._start_inotify() is True
+        self._watcher_thread = threading.Thread(target=self._watch, name="parse_it_config_watcher", daemon=True)
+        self._watcher_thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """stops watching the config files & waits for the background thread to finish
+
+                    Arguments:
+                        timeout -- the maximum number of seconds to wait for the background thread, if set to None
+                            (default) it will wait until it finishes
+        """
+        self._stop_event.set()
+        if self._watcher_thread is not None:
+            self._watcher_thread.join(timeout)
+            self._watcher_thread = None
+        self._stop_inotify()
+
+    def check(self) -> dict:
+        """reloads the parse_it object & calls the callbacks if anything changed, this is what the background thread
+                does on each change but it can also be called directly
+
+                    Returns:
+                        config_diff -- the dict returned by ParseIt.reload
+        """
+        config_diff = self.parser.reload()
+        # new subfolders are only known after the reload so they are added to the watched folders after it
+        if self.using_inotify is True and self._add_inotify_watches() is False:
+            self._stop_inotify()
+        if any(config_diff.values()):
+            for callback in list(self.callbacks):
+                callback(config_diff)
+        return config_diff
+
+    def _watch(self):
+        """internal function which is the loop of the background thread, waits for a change (or for poll_interval
+                seconds when polling) & checks the config files until asked to stop
+        """
+        while not self._stop_event.is_set():
+            if self.using_inotify is True:
+                if self._wait_for_inotify_events() is False:
+                    continue
+            elif self._stop_event.wait(self.poll_interval) is True:
+                break
+            try:
+                self.check()
+            except Exception as e:
+                # a file that is still being written might not parse yet, it will be reloaded on it's next change
+                warnings.warn("parse_it failed to reload the config files: " + str(e))
+
+    def _wait_for_inotify_events(self) -> bool:
+        """internal function which waits for inotify events & then keeps waiting until no new events came in for
+                debounce seconds
+
+            Returns:
+                True if there were events & the watcher wasn't asked to stop, False otherwise
+        """
+        if self._read_inotify_events(STOP_CHECK_INTERVAL) is False:
+            return False
+        while not self._stop_event.is_set() and self._read_inotify_events(self.debounce) is True:
+            pass
+        return not self._stop_event.is_set()
+
+    def _read_inotify_events(self, timeout: float) -> bool:
+        """internal function which waits up to timeout seconds for inotify events & reads them, the events themselves
+                aren't needed as the reload finds what changed on it's own
+
+            Arguments:
+                timeout -- the maximum number of seconds to wait
+            Returns:
+                True if there were events, False otherwise
+        """
+        inotify_fd = self._inotify_fd
+        if inotify_fd is None:
+            return False
+        try:
+            readable_fds, _, _ = select.select([inotify_fd], [], [], timeout)
+            if not readable_fds:
+                return False
+            return len(os.read(inotify_fd, 65536)) > 0
+        except (BlockingIOError, InterruptedError):
+            return False
+        except (OSError, ValueError):
+            # the inotify fd was closed by stop
+            return False
+
+    def _start_inotify(self) -> bool:
+        """internal function which creates an inotify instance & adds the watches of all the config folders
+
+            Returns:
+                True if inotify is watching the config folders, False if inotify isn't available
+        """
+        self._libc = inotify_libc()
+        if self._libc is None:
+            return False
+        inotify_fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if inotify_fd < 0:
+            return False
+        self._inotify_fd = inotify_fd
+        if self._add_inotify_watches() is False:
+            self._stop_inotify()
+            return False
+        return True
+
+    def _add_inotify_watches(self) -> bool:
+        """internal function which adds an inotify watch to all the config folders, a folder which is already watched
+                keeps it's watch
+
+            Returns:
+                True if all the config folders are watched, False otherwise (for example when out of inotify watches)
+        """
+        if self.parser.config_file_type == "folder":
+            watched_folders = list(self.parser.folders_mtimes)
+        elif self.parser.config_file_type == "file":
+            # the folder of the file is watched so replacing the file (or the symlink to it) is noticed
+            watched_folders = [os.path.dirname(os.path.abspath(self.parser.config_location))]
+        else:
+            watched_folders = []
+        if not watched_folders:
+            return False
+
+        for watched_folder in watched_folders:
+            if self._libc.inotify_add_watch(self._inotify_fd, os.fsencode(watched_folder), INOTIFY_WATCH_MASK) < 0:
+                # a subfolder that was removed since the last reload is fine, anything else isn't
+                if ctypes.get_errno() != errno.ENOENT:
+                    return False
+        return True
+
+    def _stop_inotify(self):
+        """internal function which closes the inotify instance (which removes all of it's watches) & falls back to
+                polling if the watcher is still running
+        """
+        self.using_inotify = False
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
@@ -17,13 +17,14 @@ requirements = [
     "configobj",
     "xmltodict",
     "pyhcl",
-    "python-dotenv",
-    "dpath"
+    "python-dotenv"
 ]
 
-# optional requirements, typing is used for support of Python versions 3.4 & lower, note 3.4 and lower is untested
+# optional requirements, typing is used for support of Python versions 3.4 & lower, note 3.4 and lower is untested,
+# orjson is used to parse json files faster when installed
 extra_requirements = {
-          'typing':  ["typing"]
+          'typing':  ["typing"],
+          'orjson':  ["orjson"]
       }
 
 setup(
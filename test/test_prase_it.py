@@ -10,8 +10,24 @@ from parse_it.file.env import *
 from parse_it.file.ini import *
 from parse_it.file.xml import *
 from parse_it.file.file_reader import *
+from parse_it.file.file_types import *
+from parse_it.file.compiled_cache import *
+from parse_it.config_path.config_path import *
+from parse_it.snapshot.snapshot import *
 from parse_it.type_estimate.type_estimate import *
 import os
+import tempfile
+import json
+import subprocess
+import datetime
+import ast
+from contextlib import suppress
+import sys
+import mmap
+import asyncio
+import threading
+import concurrent.futures
+import warnings
 
 
 VALID_FILE_TYPE_EXTENSIONS = [
@@ -1439,3 +1455,1317 @@ class BaseTests(TestCase):
         self.assertEqual(reply["none_upper"], None)
         self.assertEqual(reply["none_mixed"], None)
         self.assertEqual(reply["null"], None)
+
+    def test_parser_parsed_files_cache_parses_each_file_once(self):
+        parser = ParseIt(config_location=test_files_location)
+        parser.read_configuration_variable("test_xml_not_existing_key")
+        config_files_count = sum(len(config_files) for config_files in parser.config_files_dict.values())
+        self.assertEqual(parser.cache_misses, config_files_count)
+        self.assertEqual(parser.cache_hits, 0)
+        parser.read_multiple_configuration_variables(["file_type", "test_xml_not_existing_key"])
+        parser.read_all_configuration_variables()
+        self.assertEqual(parser.cache_misses, config_files_count)
+        self.assertGreater(parser.cache_hits, 0)
+
+    def test_parser_parsed_files_cache_clear_cache(self):
+        parser = ParseIt(config_location=test_files_location)
+        parser.read_configuration_variable("test_xml_not_existing_key")
+        parser.clear_cache()
+        self.assertDictEqual(parser.parsed_files_cache, {})
+        self.assertEqual(parser.cache_misses, 0)
+        self.assertEqual(parser.cache_hits, 0)
+        reply = parser.read_configuration_variable("file_type")
+        self.assertEqual(reply, "env")
+        config_files_count = sum(len(config_files) for config_files in parser.config_files_dict.values())
+        self.assertEqual(parser.cache_misses, config_files_count)
+
+    def test_parser_parsed_files_cache_invalidate(self):
+        parser = ParseIt(config_location=test_files_location)
+        parser.read_configuration_variable("test_xml_not_existing_key")
+        cache_misses = parser.cache_misses
+        parser.invalidate("test.json")
+        self.assertNotIn(os.path.abspath(test_files_location + "/test.json"), parser.parsed_files_cache)
+        parser.read_configuration_variable("test_xml_not_existing_key")
+        self.assertEqual(parser.cache_misses, cache_misses + 1)
+
+    def test_parser_invalidate_keeps_index_and_envvars(self):
+        with mock.patch.dict(os.environ, {"TEST_INVALIDATE_ENVVAR": "old"}):
+            parser = ParseIt(config_location=test_files_location, config_type_priority=["envvars", "json", "yaml"])
+            self.assertEqual(parser.read_configuration_variable("test_invalidate_envvar"), "old")
+            config_index = parser.config_index
+            os.environ["TEST_INVALIDATE_ENVVAR"] = "new"
+            parser.invalidate("test.json")
+            with mock.patch.object(parser, "_index_source", wraps=parser._index_source) as mock_index_source:
+                self.assertEqual(parser.read_configuration_variable("test_invalidate_envvar"), "old")
+            self.assertIs(parser.config_index, config_index)
+            self.assertListEqual([index_source_call.args[2] for index_source_call in mock_index_source.call_args_list],
+                                 [os.path.join(test_files_location, "test.json")])
+            parser.clear_cache()
+            self.assertEqual(parser.read_configuration_variable("test_invalidate_envvar"), "old")
+            parser.refresh_envvars()
+            self.assertEqual(parser.read_configuration_variable("test_invalidate_envvar"), "new")
+
+    def test_parser_parsed_files_cache_file_changed(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            with open(os.path.join(config_folder, "test.json"), "w") as f:
+                f.write('{"test_cache_key": "first_value"}')
+            parser = ParseIt(config_location=config_folder, config_type_priority=["json"])
+            reply = parser.read_configuration_variable("test_cache_key")
+            self.assertEqual(reply, "first_value")
+            with open(os.path.join(config_folder, "test.json"), "w") as f:
+                f.write('{"test_cache_key": "second_value_longer"}')
+            reply = parser.read_configuration_variable("test_cache_key")
+            self.assertEqual(reply, "second_value_longer")
+            self.assertEqual(parser.cache_misses, 2)
+
+    def test_parser_parsed_files_cache_not_changed_by_caller(self):
+        parser = ParseIt(config_location=test_files_location, type_estimate=False)
+        reply = parser.read_configuration_variable("test_json")
+        reply["test_json_key"] = "changed_value"
+        reply = parser.read_all_configuration_variables()
+        reply["test_yaml"]["test_yaml_key"] = "changed_value"
+        reply = parser.read_configuration_variable("test_json")
+        self.assertDictEqual(reply, {"test_json_key": "test_json_value"})
+        reply = parser.read_all_configuration_variables()
+        self.assertDictEqual(reply["test_yaml"], {"test_yaml_key": "test_yaml_value"})
+
+    def test_parser_config_index_source(self):
+        test_args = ["parse_it_mock_script.py", "--test_cli_key_source", "test_value"]
+        with mock.patch('sys.argv', test_args):
+            parser = ParseIt(config_location=test_files_location)
+            self.assertTupleEqual(parser.read_configuration_variable_source("test_cli_key_source"), ("cli_args", None))
+        self.assertTupleEqual(parser.read_configuration_variable_source("file_type"),
+                              ("env", os.path.join(test_files_location, "test.env")))
+        self.assertTupleEqual(parser.read_configuration_variable_source("test_yaml"),
+                              ("yaml", os.path.join(test_files_location, "test.yaml")))
+        self.assertTupleEqual(parser.read_configuration_variable_source("test_non_existing_key"), (None, None))
+        self.assertEqual(parser.config_index["test_json"][1:],
+                         ("json", os.path.join(test_files_location, "test.json"), {'test_json_key': 'test_json_value'}))
+
+    def test_parser_config_index_envvar_source(self):
+        test_envvars = {"PREFIX_TEST_INDEX_FILE_TYPE": "envvar"}
+        with mock.patch.dict(os.environ, test_envvars):
+            parser = ParseIt(config_location=test_files_location, envvar_prefix="prefix_test_index_",
+                             config_type_priority=["env", "env_vars", "json"])
+            self.assertTupleEqual(parser.read_configuration_variable_source("file_type"), ("env", os.path.join(
+                test_files_location, "test.env")))
+            parser = ParseIt(config_location=test_files_location, envvar_prefix="prefix_test_index_",
+                             config_type_priority=["env_vars", "env", "json"])
+            self.assertTupleEqual(parser.read_configuration_variable_source("file_type"), ("env_vars", None))
+            self.assertEqual(parser.read_configuration_variable("file_type"), "envvar")
+            self.assertNotIn("PATH", parser.envvars_snapshot)
+
+    def test_parser_config_index_rebuild_index(self):
+        parser = ParseIt(config_location=test_files_location, config_type_priority=["env_vars", "json"])
+        self.assertIsNone(parser.read_configuration_variable("test_rebuild_index_key"))
+        self.assertIsNotNone(parser.config_index)
+        with mock.patch.dict(os.environ, {"TEST_REBUILD_INDEX_KEY": "123"}):
+            self.assertIsNone(parser.read_configuration_variable("test_rebuild_index_key"))
+            parser.rebuild_index()
+            self.assertEqual(parser.read_configuration_variable("test_rebuild_index_key"), 123)
+
+    def test_file_reader_file_types_in_folder_single_scan_large_tree(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            expected_reply = {file_type_ending: [] for file_type_ending in VALID_FILE_TYPE_EXTENSIONS}
+            folders_count = 1
+            for first_level in range(10):
+                for second_level in range(10):
+                    sub_folder = os.path.join("folder_" + str(first_level), "sub_folder_" + str(second_level))
+                    os.makedirs(os.path.join(config_folder, sub_folder))
+                    for file_number in range(20):
+                        file_type_ending = VALID_FILE_TYPE_EXTENSIONS[file_number % len(VALID_FILE_TYPE_EXTENSIONS)]
+                        file_name = os.path.join(sub_folder, "file_" + str(file_number) + "." + file_type_ending)
+                        open(os.path.join(config_folder, file_name), "w").close()
+                        expected_reply[file_type_ending].append(os.path.join(config_folder, file_name))
+                    open(os.path.join(config_folder, sub_folder, "not_a_config_file.txt"), "w").close()
+                folders_count += 11
+            open(os.path.join(config_folder, "top_level.json"), "w").close()
+            expected_reply["json"].append("top_level.json")
+            for file_type_ending in expected_reply:
+                expected_reply[file_type_ending].sort()
+
+            with mock.patch("os.scandir", wraps=os.scandir) as scandir_mock:
+                reply = file_types_in_folder(config_folder, VALID_FILE_TYPE_EXTENSIONS)
+            self.assertDictEqual(reply, expected_reply)
+            self.assertEqual(sum(len(config_files) for config_files in reply.values()), 2001)
+            self.assertEqual(scandir_mock.call_count, folders_count)
+
+    def test_file_reader_file_types_in_folder_multiple_dots_suffix(self):
+        reply = file_suffixes("my.config.yaml")
+        self.assertListEqual(reply, ["config.yaml", "yaml"])
+        with tempfile.TemporaryDirectory() as config_folder:
+            open(os.path.join(config_folder, "my.config.yaml"), "w").close()
+            open(os.path.join(config_folder, "my_yaml"), "w").close()
+            reply = file_types_in_folder(config_folder, ["yaml", "config.yaml"], recurse=False)
+            self.assertDictEqual(reply, {"yaml": ["my.config.yaml"], "config.yaml": ["my.config.yaml"]})
+
+    def test_import_does_not_load_unused_file_type_backends(self):
+        import_time_output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import parse_it"],
+                                            capture_output=True, text=True, check=True).stderr
+        imported_modules = [import_time_line.split("|")[-1].strip() for import_time_line in
+                            import_time_output.splitlines() if import_time_line.startswith("import time:")]
+        self.assertIn("parse_it.parser", imported_modules)
+        for backend_module in ["yaml", "toml", "hcl", "ply", "xmltodict", "dotenv", "configobj", "dpath"]:
+            self.assertNotIn(backend_module, imported_modules)
+
+    def test_file_type_backend_loaded_on_first_use(self):
+        reply = subprocess.run([sys.executable, "-c", "import sys, parse_it\n"
+                                "parser = parse_it.ParseIt(config_location='" + test_files_location + "/test.json')\n"
+                                "parser.read_configuration_variable('file_type')\n"
+                                "print('json' in sys.modules, 'yaml' in sys.modules)"],
+                               capture_output=True, text=True, check=True).stdout
+        self.assertEqual(reply.strip(), "True False")
+        import parse_it
+        self.assertEqual(parse_it.parse_json_file, parse_json_file)
+        with self.assertRaises(AttributeError):
+            parse_it.parse_non_existing_file
+
+    def test_file_types_register_file_type(self):
+        def parse_properties_file(path_to_properties_file):
+            return dict(line.split("=", 1) for line in read_file(path_to_properties_file).splitlines())
+
+        with mock.patch.dict(FILE_TYPES):
+            register_file_type("properties", ["properties", "props"], parse_properties_file)
+            self.assertEqual(file_type_of_parser_function("parse_properties_file"), "properties")
+            with tempfile.TemporaryDirectory() as config_folder:
+                with open(os.path.join(config_folder, "test.props"), "w") as f:
+                    f.write("test_properties_key=123")
+                parser = ParseIt(config_location=config_folder, config_type_priority=["props", "json"])
+                self.assertEqual(parser.suffix_file_types["props"], "properties")
+                self.assertIn("properties", parser.valid_file_type_extension)
+                reply = parser.read_configuration_variable("test_properties_key")
+                self.assertEqual(reply, 123)
+        self.assertNotIn("properties", FILE_TYPES)
+        self.assertIsNone(file_type_of_parser_function("parse_properties_file"))
+
+    def test_file_types_custom_suffix_mapping_dispatch(self):
+        parser = ParseIt(config_location=test_files_location, custom_suffix_mapping={"yaml": ["custom"]},
+                         config_type_priority=["custom"] + VALID_FILE_TYPE_EXTENSIONS)
+        self.assertEqual(parser.suffix_file_types["custom"], "yaml")
+        self.assertEqual(parser.suffix_file_types["yml"], "yaml")
+        self.assertEqual(parser.suffix_file_types["cfg"], "ini")
+
+    def test_file_types_fast_path_parsers(self):
+        import parse_it.file.json
+        import parse_it.file.toml
+        import parse_it.file.yaml
+        if sys.version_info >= (3, 11):
+            self.assertIsNotNone(parse_it.file.toml.tomllib)
+        if hasattr(yaml, "CFullLoader"):
+            self.assertEqual(parse_it.file.yaml.YAML_LOADER, yaml.CFullLoader)
+        with tempfile.TemporaryDirectory() as config_folder:
+            with open(os.path.join(config_folder, "test.json"), "w") as f:
+                f.write('{"test_nan": NaN, "test_big_int": 123456789012345678901234567890}')
+            reply = parse_json_file(os.path.join(config_folder, "test.json"))
+            self.assertNotEqual(reply["test_nan"], reply["test_nan"])
+            self.assertEqual(reply["test_big_int"], 123456789012345678901234567890)
+            with mock.patch.object(parse_it.file.json, "orjson", None):
+                reply = parse_json_file(test_files_location + "/test.json")
+                self.assertEqual(reply["test_json"], {'test_json_key': 'test_json_value'})
+            with mock.patch.object(parse_it.file.toml, "tomllib", None):
+                reply = parse_toml_file(test_files_location + "/test.toml")
+                self.assertEqual(reply["test_toml"], {'test_toml_key': 'test_toml_value'})
+
+    def test_type_estimate_dict_large_nested_config_same_as_literal_eval(self):
+        def literal_eval_estimate_type(node):
+            # the previous estimate_type behavior for dicts, turning the whole dict to a string & parsing it back
+            node = ast.literal_eval(str(node))
+            return {key: estimate_type(value) if not isinstance(value, dict) else literal_eval_estimate_type(value)
+                    for key, value in node.items()}
+
+        test_values = ["true", "False", "123", "123.123", "none", "", "testing", "kafka:8082", "['test1', '2']",
+                       "{'test_key': 'null'}"]
+        large_config = {}
+        for first_level in range(100):
+            second_level_dict = {}
+            for second_level in range(100):
+                second_level_dict["key_" + str(second_level)] = {
+                    "value_" + str(value_number): test_value for value_number, test_value in enumerate(test_values)
+                }
+                second_level_dict["list_" + str(second_level)] = {"element": test_values}
+            large_config["section_" + str(first_level)] = second_level_dict
+        self.assertGreater(len(str(large_config)), 2 * 1024 * 1024)
+
+        reply = estimate_type(large_config)
+        for section_number in range(0, 100, 25):
+            section_key = "section_" + str(section_number)
+            self.assertDictEqual(reply[section_key], literal_eval_estimate_type(large_config[section_key]))
+        self.assertDictEqual(reply["section_0"]["key_0"], {
+            "value_0": True,
+            "value_1": False,
+            "value_2": 123,
+            "value_3": 123.123,
+            "value_4": None,
+            "value_5": None,
+            "value_6": "testing",
+            "value_7": "kafka:8082",
+            "value_8": ["test1", 2],
+            "value_9": {"test_key": None}
+        })
+
+    def test_type_estimate_dict_non_literal_values(self):
+        test_date = datetime.date(2020, 1, 1)
+        reply = estimate_type({"test_date": test_date, "test_int": "123", "test_dict": {"test_float": "1.5"}})
+        self.assertDictEqual(reply, {"test_date": test_date, "test_int": 123, "test_dict": {"test_float": 1.5}})
+
+    def test_type_estimate_fast_path_same_as_literal_eval(self):
+        def literal_eval_estimate_type(node):
+            # the previous estimate_type behavior for strings, running all of them through ast.literal_eval
+            if node.lower() in {"true", "false"}:
+                node = node.title()
+            elif node.lower() in {"", "null", "none"}:
+                node = "None"
+            with suppress(ValueError, SyntaxError):
+                node = ast.literal_eval(node)
+            return node
+
+        test_values = ["8080", "-12", "+12", "0", "00", "0123", "0x1F", "1_000", "1j", "123.123", "-.5", "5.", "1e3",
+                       "1.5E-3", "inf", "nan", "True", "FALSE", "None", "NULL", "", "hello", "hello world",
+                       "localhost:9092", "http://test:8080/path", "/var/lib/test", "10.0.0.1", "1.2.3", "...", "'quoted'",
+                       "r'raw'", "b'bytes'", "u'unicode'", "set()", "True, 1", "None,", "1, 2", "(1, 2)", "{1, 2}",
+                       " 123", "123 ", "\t1", "#comment\n1", "not True", "lambda: 1", "test_value", "é", "1st",
+                       "2020-01-01", "kafka:8082", "$HOME", "~/test", "@test", "-", "+", ".", "_", "a.b.c"]
+        for test_value in test_values:
+            reply = estimate_type(test_value)
+            expected_reply = literal_eval_estimate_type(test_value)
+            self.assertEqual(type(reply), type(expected_reply), test_value)
+            if reply == reply:
+                self.assertEqual(reply, expected_reply, test_value)
+
+    def test_type_estimate_fast_path_skips_literal_eval(self):
+        with mock.patch("ast.literal_eval", side_effect=AssertionError("ast.literal_eval should not be used")):
+            self.assertEqual(estimate_type("8080"), 8080)
+            self.assertEqual(estimate_type("-1.5e3"), -1500.0)
+            self.assertEqual(estimate_type("true"), True)
+            self.assertIsNone(estimate_type("null"))
+            self.assertEqual(estimate_type("localhost:9092"), "localhost:9092")
+            self.assertEqual(estimate_type("10.0.0.1"), "10.0.0.1")
+            self.assertEqual(estimate_type("/var/lib/test"), "/var/lib/test")
+        self.assertTrue(is_plain_string("hello"))
+        self.assertFalse(is_plain_string("['hello']"))
+        self.assertFalse(is_plain_string("b'hello'"))
+        self.assertFalse(is_plain_string("True, 1"))
+
+    def test_type_estimate_cache(self):
+        type_estimate_cache = TypeEstimateCache(maxsize=2)
+        reply = estimate_type({"first": "123", "second": "123", "third": "true"},
+                              type_estimate_cache=type_estimate_cache)
+        self.assertDictEqual(reply, {"first": 123, "second": 123, "third": True})
+        cache_info = type_estimate_cache.cache_info()
+        self.assertEqual((cache_info.hits, cache_info.misses, cache_info.maxsize, cache_info.currsize), (1, 2, 2, 2))
+        estimate_type("new_value", type_estimate_cache=type_estimate_cache)
+        estimate_type("123", type_estimate_cache=type_estimate_cache)
+        self.assertEqual(type_estimate_cache.cache_info().misses, 4)
+        estimate_type("123", none_values={"null"}, type_estimate_cache=type_estimate_cache)
+        self.assertEqual(type_estimate_cache.cache_info().misses, 5)
+        type_estimate_cache.cache_clear()
+        self.assertEqual(type_estimate_cache.cache_info().currsize, 0)
+
+    def test_type_estimate_cache_returns_copies(self):
+        type_estimate_cache = TypeEstimateCache()
+        reply = estimate_type("['test1', {'key': '1'}]", type_estimate_cache=type_estimate_cache)
+        self.assertListEqual(reply, ["test1", {"key": 1}])
+        reply.append("test2")
+        reply[1]["key"] = 2
+        reply = estimate_type("['test1', {'key': '1'}]", type_estimate_cache=type_estimate_cache)
+        self.assertListEqual(reply, ["test1", {"key": 1}])
+        self.assertEqual(type_estimate_cache.cache_info().hits, 1)
+
+    def test_parser_type_estimate_cache_size(self):
+        parser = ParseIt(config_location=test_files_location)
+        self.assertIsNone(parser.type_estimate_cache)
+        test_envvars = {"TEST_TYPE_ESTIMATE_CACHE_FIRST": "true", "TEST_TYPE_ESTIMATE_CACHE_SECOND": "true"}
+        with mock.patch.dict(os.environ, test_envvars):
+            parser = ParseIt(config_location=test_files_location, type_estimate_cache_size=128)
+            reply = parser.read_multiple_configuration_variables(["test_type_estimate_cache_first",
+                                                                  "test_type_estimate_cache_second",
+                                                                  "test_type_estimate_cache_first"])
+        self.assertDictEqual(reply, {"test_type_estimate_cache_first": True, "test_type_estimate_cache_second": True})
+        cache_info = parser.type_estimate_cache.cache_info()
+        self.assertEqual((cache_info.hits, cache_info.misses, cache_info.maxsize), (2, 1, 128))
+
+    def test_command_line_args_parse_cli_args_formats(self):
+        test_args = ["parse_it_mock_script.py", "--test_key", "test_value", "--test_equal=test=value", "--test_flag",
+                     "--test_repeated", "1", "--test_repeated", "2", "--test_repeated=3", "positional", "--test_offset",
+                     "-5", "-wrong_format_test_key", "test_value", "--test_last_flag", "--", "--test_ignored", "value"]
+        expected_reply = {
+            "test_key": "test_value",
+            "test_equal": "test=value",
+            "test_flag": True,
+            "test_repeated": ["1", "2", "3"],
+            "test_offset": "-5",
+            "test_last_flag": True
+        }
+        self.assertDictEqual(parse_cli_args(test_args), expected_reply)
+        with mock.patch('sys.argv', test_args):
+            self.assertEqual(read_command_line_arg("test_flag"), True)
+            self.assertListEqual(read_command_line_arg("test_repeated"), ["1", "2", "3"])
+            self.assertFalse(command_line_arg_defined("test_ignored"))
+            parser = ParseIt(config_location=test_files_location)
+            self.assertEqual(parser.read_configuration_variable("test_offset"), -5)
+            self.assertEqual(parser.read_configuration_variable("test_flag"), True)
+
+    def test_command_line_args_parsed_once_per_argv(self):
+        test_args = ["parse_it_mock_script.py"] + ["--test_key_" + str(arg_number) + "=" + str(arg_number) for
+                                                   arg_number in range(10000)]
+        with mock.patch('sys.argv', test_args):
+            with mock.patch("parse_it.command_line_args.command_line_args.parse_cli_args",
+                            wraps=parse_cli_args) as parse_cli_args_mock:
+                for arg_number in range(10000):
+                    self.assertEqual(read_command_line_arg("test_key_" + str(arg_number)), str(arg_number))
+                self.assertEqual(len(read_all_cli_args_to_dict()), 10000)
+                self.assertEqual(parse_cli_args_mock.call_count, 1)
+                sys.argv.append("--test_appended_key")
+                self.assertTrue(command_line_arg_defined("test_appended_key"))
+                self.assertEqual(parse_cli_args_mock.call_count, 2)
+        with mock.patch('sys.argv', ["parse_it_mock_script.py"]):
+            self.assertFalse(command_line_arg_defined("test_key_0"))
+
+    def test_command_line_args_returned_lists_are_copies(self):
+        test_args = ["parse_it_mock_script.py", "--test_repeated", "1", "--test_repeated", "2"]
+        with mock.patch('sys.argv', test_args):
+            read_command_line_arg("test_repeated").append("3")
+            read_all_cli_args_to_dict()["test_repeated"].append("3")
+            self.assertListEqual(read_command_line_arg("test_repeated"), ["1", "2"])
+
+    def test_envvars_read_envvars_snapshot(self):
+        test_envvars = {"TEST_SNAPSHOT_KEY": "test\\tvalue", "test_snapshot_lower": "lower",
+                        "TEST_SNAPSHOT_UNICODE": "\u05e9\u05dc\u05d5\u05dd"}
+        with mock.patch.dict(os.environ, test_envvars):
+            reply = read_envvars_snapshot(envvar_prefix="test_snapshot_")
+            self.assertDictEqual(reply, {"KEY": "test\tvalue", "UNICODE": "\u05e9\u05dc\u05d5\u05dd"})
+            reply = read_envvars_snapshot(envvar_prefix="test_snapshot_", force_uppercase=False)
+            self.assertDictEqual(reply, {"lower": "lower"})
+
+    def test_parser_envvars_snapshot_read_once(self):
+        with mock.patch.dict(os.environ, {"TEST_SNAPSHOT_ONCE": "123"}):
+            parser = ParseIt(config_location=test_files_location, config_type_priority=["envvars", "json"])
+            with mock.patch("os.environ", wraps=os.environ) as mock_environ:
+                self.assertEqual(parser.read_configuration_variable("test_snapshot_once"), 123)
+                self.assertEqual(parser.read_configuration_variable("test_snapshot_once"), 123)
+                self.assertIsNone(parser.read_configuration_variable("test_snapshot_non_existing"))
+                self.assertEqual(mock_environ.items.call_count, 1)
+
+    def test_parser_refresh_envvars(self):
+        parser = ParseIt(config_location=test_files_location, config_type_priority=["envvars", "json"])
+        self.assertEqual(parser.read_configuration_variable("test_json", default_value="default"),
+                         {'test_json_key': 'test_json_value'})
+        cache_misses = parser.cache_misses
+        with mock.patch.dict(os.environ, {"TEST_JSON": "envvar"}):
+            self.assertDictEqual(parser.read_configuration_variable("test_json"), {'test_json_key': 'test_json_value'})
+            parser.refresh_envvars()
+            self.assertEqual(parser.read_configuration_variable("test_json"), "envvar")
+            self.assertTupleEqual(parser.read_configuration_variable_source("test_json"), ("envvars", None))
+        parser.refresh_envvars()
+        self.assertDictEqual(parser.read_configuration_variable("test_json"), {'test_json_key': 'test_json_value'})
+        self.assertEqual(parser.cache_misses, cache_misses)
+
+    def test_envvars_split_envvar_combained_dict_conflicts(self):
+        test_envvars = {"TEST_CONFLICT_A": "value", "TEST_CONFLICT_A_B": "nested", "TEST_CONFLICT_C_D": "nested",
+                        "TEST_CONFLICT_C": "value", "TEST_CONFLICT_E__F": "empty", "TEST_CONFLICT_G_": "trailing"}
+        with mock.patch.dict(os.environ, test_envvars, clear=True):
+            reply = split_envvar_combained_dict()
+        self.assertDictEqual(reply, {"test": {"conflict": {"a": {"b": "nested"}, "c": "value", "e": {"": {"f": "empty"}},
+                                                           "g": {"": "trailing"}}}})
+
+    def test_envvars_split_envvar_combained_dict_many_envvars(self):
+        test_envvars = {}
+        for envvar_number in range(2000):
+            envvar_path = ["L" + str((envvar_number // (depth + 1)) % 7) for depth in range(envvar_number % 5 + 1)]
+            test_envvars["_".join(["TEST", "MANY"] + envvar_path + ["K" + str(envvar_number)])] = str(envvar_number)
+        with mock.patch.dict(os.environ, test_envvars, clear=True):
+            reply = split_envvar_combained_dict()
+        self.assertEqual(len(reply), 1)
+        for envvar_key, envvar_value in test_envvars.items():
+            envvar_nest = reply
+            for envvar_key_part in envvar_key.lower().split("_"):
+                envvar_nest = envvar_nest[envvar_key_part]
+            self.assertEqual(envvar_nest, envvar_value)
+
+    def test_read_all_envvars_to_dict_envvar_prefix(self):
+        test_envvars = {"PREFIX_READ_ALL_KEY": "123", "prefix_read_all_lowercase": "456", "OTHER_READ_ALL_KEY": "789"}
+        with mock.patch.dict(os.environ, test_envvars):
+            reply = read_all_envvars_to_dict(envvar_prefix="prefix_read_all_")
+            self.assertDictEqual(reply, {"key": "123", "lowercase": "456"})
+            reply = read_all_envvars_to_dict(force_uppercase=False, envvar_prefix="PREFIX_READ_ALL_")
+            self.assertDictEqual(reply, {"KEY": "123"})
+
+    def test_envvars_split_envvar_combained_dict_envvar_prefix(self):
+        test_envvars = {"PREFIX_SPLIT_NEST1_KEY": "123", "PREFIX_SPLIT_NEST2": "456", "OTHER_SPLIT_NEST1_KEY": "789"}
+        with mock.patch.dict(os.environ, test_envvars):
+            reply = split_envvar_combained_dict(envvar_prefix="prefix_split_")
+            self.assertDictEqual(reply, {"nest1": {"key": "123"}, "nest2": "456"})
+
+    def test_parser_read_all_configuration_variables_envvar_prefix(self):
+        test_envvars = {"PREFIX_READ_ALL_NEST1_NEST2": "123", "PREFIX_READ_ALL_FLAT": "456"}
+        with mock.patch.dict(os.environ, test_envvars):
+            parser = ParseIt(config_location=test_files_location, envvar_prefix="prefix_read_all_",
+                             envvar_divider="_")
+            reply = parser.read_all_configuration_variables()
+            self.assertDictEqual(reply["nest1"], {"nest2": 123})
+            self.assertEqual(reply["flat"], 456)
+            self.assertNotIn("prefix", reply)
+            self.assertNotIn("path", reply)
+            self.assertEqual(reply["file_type"], "env")
+            parser = ParseIt(config_location=test_files_location, envvar_prefix="prefix_read_all_")
+            reply = parser.read_all_configuration_variables()
+            self.assertEqual(reply["nest1_nest2"], 123)
+            self.assertNotIn("path", reply)
+
+    def test_parser_parallel_parsing(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            for config_file_number in range(8):
+                config_file_dict = {"shared_key": config_file_number, "file_key_" + str(config_file_number): "value",
+                                    "padding": ["padding_value_" + str(padding) for padding in range(1000)]}
+                for config_file_type in ["json", "yaml"]:
+                    with open(os.path.join(config_folder, "config" + str(config_file_number) + "." + config_file_type),
+                              "w") as config_file:
+                        config_file.write(json.dumps(config_file_dict))
+            serial_parser = ParseIt(config_location=config_folder, config_type_priority=["yaml", "json"])
+            serial_reply = serial_parser.read_all_configuration_variables()
+            for parallel_parsing in ["threads", "processes"]:
+                parser = ParseIt(config_location=config_folder, config_type_priority=["yaml", "json"],
+                                 parallel_parsing=parallel_parsing, max_workers=2)
+                self.assertDictEqual(parser.read_all_configuration_variables(), serial_reply)
+                self.assertEqual(parser.cache_misses, 16)
+                self.assertEqual(parser.cache_hits, 0)
+                self.assertEqual(parser.read_configuration_variable("shared_key"),
+                                 serial_parser.read_configuration_variable("shared_key"))
+                self.assertEqual(parser.cache_misses, 16)
+
+    def test_parser_parallel_parsing_small_input_is_serial(self):
+        with mock.patch("concurrent.futures.ThreadPoolExecutor") as mock_executor:
+            parser = ParseIt(config_location=test_files_location, parallel_parsing="threads")
+            reply = parser.read_all_configuration_variables()
+            mock_executor.assert_not_called()
+        self.assertEqual(reply["file_type"], "env")
+        with self.assertRaises(ValueError):
+            ParseIt(config_location=test_files_location, parallel_parsing="fibers")
+
+    def test_async_parser_read_configuration_variable(self):
+        from parse_it import AsyncParseIt
+        parser = AsyncParseIt(config_location=test_files_location)
+        self.assertEqual(asyncio.run(parser.read_configuration_variable("file_type")), "env")
+        self.assertDictEqual(asyncio.run(parser.read_configuration_variable("test_json")),
+                             {'test_json_key': 'test_json_value'})
+        self.assertEqual(asyncio.run(parser.read_configuration_variable("test_non_existing_key",
+                                                                        default_value="default")), "default")
+        with self.assertRaises(ValueError):
+            asyncio.run(parser.read_configuration_variable("test_non_existing_key", required=True))
+        self.assertTupleEqual(asyncio.run(parser.read_configuration_variable_source("test_yaml")),
+                              ("yaml", os.path.join(test_files_location, "test.yaml")))
+        reply = asyncio.run(parser.read_multiple_configuration_variables(["file_type", "test_int"]))
+        self.assertDictEqual(reply, {"file_type": "env", "test_int": 123})
+
+    def test_async_parser_read_all_configuration_variables(self):
+        from parse_it import AsyncParseIt
+        parser = AsyncParseIt(config_location=test_files_location, recurse=True)
+        reply = asyncio.run(parser.read_all_configuration_variables(default_value={"default_value_test": "it_works"}))
+        self.assertDictEqual(reply, ParseIt(config_location=test_files_location, recurse=True)
+                             .read_all_configuration_variables(default_value={"default_value_test": "it_works"}))
+        cache_misses = parser.cache_misses
+        self.assertGreater(cache_misses, 1)
+        self.assertDictEqual(asyncio.run(parser.read_configuration_variable("test_yaml")),
+                             {'test_yaml_key': 'test_yaml_value'})
+        self.assertEqual(parser.cache_misses, cache_misses)
+
+    def test_async_parser_parses_files_in_executor(self):
+        from parse_it import AsyncParseIt
+        parsing_threads = set()
+        parse_json_file_function = load_file_parser("json")
+
+        def thread_recording_parse_json_file(config_file_location):
+            parsing_threads.add(threading.get_ident())
+            return parse_json_file_function(config_file_location)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            with mock.patch.dict(FILE_TYPES["json"], {"parser": thread_recording_parse_json_file}):
+                parser = AsyncParseIt(config_location=test_files_location, config_type_priority=["json"],
+                                      executor=executor)
+                reply = asyncio.run(parser.read_configuration_variable("test_json"))
+        self.assertDictEqual(reply, {'test_json_key': 'test_json_value'})
+        self.assertTrue(parsing_threads)
+        self.assertNotIn(threading.get_ident(), parsing_threads)
+
+    def test_parser_reload(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            os.mkdir(os.path.join(config_folder, "subfolder"))
+            with open(os.path.join(config_folder, "first.json"), "w") as config_file:
+                config_file.write('{"first_key": 1, "shared_key": "first"}')
+            with open(os.path.join(config_folder, "subfolder", "second.yaml"), "w") as config_file:
+                config_file.write('second_key: 2\nshared_key: second\n')
+            parser = ParseIt(config_location=config_folder, recurse=True, config_type_priority=["json", "yaml"])
+            self.assertEqual(parser.read_configuration_variable("shared_key"), "first")
+            self.assertDictEqual(parser.reload(), {"added_files": [], "removed_files": [], "modified_files": [],
+                                                   "changed_keys": []})
+
+            with mock.patch("parse_it.parser.file_types_in_folder") as mock_file_types_in_folder:
+                with open(os.path.join(config_folder, "first.json"), "w") as config_file:
+                    config_file.write('{"first_key": 1, "shared_key": "changed", "new_key": true}')
+                reply = parser.reload()
+                mock_file_types_in_folder.assert_not_called()
+            self.assertDictEqual(reply, {"added_files": [], "removed_files": [],
+                                         "modified_files": [os.path.join(config_folder, "first.json")],
+                                         "changed_keys": ["new_key", "shared_key"]})
+            self.assertEqual(parser.read_configuration_variable("shared_key"), "changed")
+            cache_misses = parser.cache_misses
+
+            with open(os.path.join(config_folder, "subfolder", "third.yaml"), "w") as config_file:
+                config_file.write('third_key: 3\n')
+            os.remove(os.path.join(config_folder, "first.json"))
+            reply = parser.reload()
+            self.assertDictEqual(reply, {"added_files": [os.path.join(config_folder, "subfolder", "third.yaml")],
+                                         "removed_files": [os.path.join(config_folder, "first.json")],
+                                         "modified_files": [],
+                                         "changed_keys": ["first_key", "new_key", "shared_key", "third_key"]})
+            self.assertEqual(parser.cache_misses, cache_misses + 1)
+            self.assertEqual(parser.read_configuration_variable("shared_key"), "second")
+            self.assertEqual(parser.read_configuration_variable("third_key"), 3)
+            self.assertIsNone(parser.read_configuration_variable("first_key"))
+
+    def test_parser_reload_detects_replaced_file(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            config_file_location = os.path.join(config_folder, "config.json")
+            with open(config_file_location, "w") as config_file:
+                config_file.write('{"test_key": 1}')
+            parser = ParseIt(config_location=config_file_location, config_type_priority=["json"])
+            self.assertEqual(parser.read_configuration_variable("test_key"), 1)
+            config_file_stat = os.stat(config_file_location)
+            # a file swapped for another one with the same size & modification time is still picked up by it's inode
+            with open(config_file_location + ".new", "w") as config_file:
+                config_file.write('{"test_key": 2}')
+            os.utime(config_file_location + ".new", ns=(config_file_stat.st_atime_ns, config_file_stat.st_mtime_ns))
+            os.replace(config_file_location + ".new", config_file_location)
+            reply = parser.reload()
+            self.assertListEqual(reply["modified_files"], [config_file_location])
+            self.assertListEqual(reply["changed_keys"], ["test_key"])
+            self.assertEqual(parser.read_configuration_variable("test_key"), 2)
+
+    def test_config_watcher_inotify(self):
+        from parse_it import ConfigWatcher
+        with tempfile.TemporaryDirectory() as config_folder:
+            os.mkdir(os.path.join(config_folder, "subfolder"))
+            with open(os.path.join(config_folder, "subfolder", "config.json"), "w") as config_file:
+                config_file.write('{"test_key": 1}')
+            parser = ParseIt(config_location=config_folder, recurse=True, config_type_priority=["json"])
+            config_diffs = []
+            config_changed = threading.Event()
+
+            def last_change_reloaded(config_diff: dict):
+                if parser.read_configuration_variable("test_key") == 4444:
+                    config_changed.set()
+
+            # a slow machine can still split the writes between two reloads so only the last reload is checked
+            watcher = ConfigWatcher(parser, callbacks=[config_diffs.append], debounce=0.2)
+            watcher.add_callback(last_change_reloaded)
+            watcher.start()
+            try:
+                if watcher.using_inotify is False:
+                    self.skipTest("inotify is not available")
+                for config_value in [22, 333, 4444]:
+                    with open(os.path.join(config_folder, "subfolder", "config.json"), "w") as config_file:
+                        config_file.write('{"test_key": ' + str(config_value) + '}')
+                self.assertTrue(config_changed.wait(10))
+            finally:
+                watcher.stop()
+            self.assertGreaterEqual(len(config_diffs), 1)
+            self.assertListEqual(config_diffs[-1]["changed_keys"], ["test_key"])
+            self.assertEqual(parser.read_configuration_variable("test_key"), 4444)
+            self.assertFalse(watcher.using_inotify)
+
+    def test_config_watcher_polling(self):
+        from parse_it import ConfigWatcher
+        with tempfile.TemporaryDirectory() as config_folder:
+            with open(os.path.join(config_folder, "config.json"), "w") as config_file:
+                config_file.write('{"test_key": 1}')
+            parser = ParseIt(config_location=config_folder, config_type_priority=["json"])
+            config_diffs = []
+            config_changed = threading.Event()
+            watcher = ConfigWatcher(parser, callbacks=[config_diffs.append, lambda config_diff: config_changed.set()],
+                                    poll_interval=0.05, use_inotify=False)
+            watcher.start()
+            try:
+                self.assertFalse(watcher.using_inotify)
+                with open(os.path.join(config_folder, "new_config.json"), "w") as config_file:
+                    config_file.write('{"new_test_key": 2}')
+                self.assertTrue(config_changed.wait(10))
+            finally:
+                watcher.stop()
+            self.assertListEqual(config_diffs[0]["added_files"], [os.path.join(config_folder, "new_config.json")])
+            self.assertListEqual(config_diffs[0]["changed_keys"], ["new_test_key"])
+            self.assertEqual(parser.read_configuration_variable("new_test_key"), 2)
+
+    def test_config_watcher_async_parser(self):
+        from parse_it import ConfigWatcher, AsyncParseIt
+        with tempfile.TemporaryDirectory() as config_folder:
+            with open(os.path.join(config_folder, "config.json"), "w") as config_file:
+                config_file.write('{"test_key": 1}')
+            parser = AsyncParseIt(config_location=config_folder, config_type_priority=["json"])
+            watcher = ConfigWatcher(parser, poll_interval=60, use_inotify=False)
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                watcher.start()
+            watcher.stop()
+            self.assertIsNotNone(parser.config_index)
+            with open(os.path.join(config_folder, "config.json"), "w") as config_file:
+                config_file.write('{"test_key": 22}')
+            self.assertListEqual(watcher.check()["changed_keys"], ["test_key"])
+            self.assertEqual(asyncio.run(parser.read_configuration_variable("test_key")), 22)
+
+    def test_config_watcher_falls_back_to_polling(self):
+        from parse_it import ConfigWatcher
+        with mock.patch("parse_it.watcher.watcher.inotify_libc", return_value=None):
+            watcher = ConfigWatcher(ParseIt(config_location=test_files_location), poll_interval=60)
+            watcher.start()
+            self.assertFalse(watcher.using_inotify)
+            watcher.stop()
+        self.assertDictEqual(watcher.check(), {"added_files": [], "removed_files": [], "modified_files": [],
+                                               "changed_keys": []})
+
+    def test_parser_config_key_sources(self):
+        parser = ParseIt(config_location=test_files_location, config_type_priority=["json", "yaml", "env"])
+        parser.rebuild_index()
+        self.assertListEqual([key_source[2:4] for key_source in parser.config_key_sources["file_type"]],
+                             [("json", os.path.join(test_files_location, "test.json")),
+                              ("yaml", os.path.join(test_files_location, "test.yaml")),
+                              ("env", os.path.join(test_files_location, "test.env"))])
+        self.assertEqual(parser.config_index["file_type"], parser.config_key_sources["file_type"][0][:1] +
+                         parser.config_key_sources["file_type"][0][2:])
+
+    def test_parser_incremental_merge_of_changed_file(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            for config_file_number in range(5):
+                with open(os.path.join(config_folder, "config" + str(config_file_number) + ".json"), "w") as config_file:
+                    config_file.write(json.dumps({"shared_key": config_file_number,
+                                                  "file_key_" + str(config_file_number): config_file_number}))
+            parser = ParseIt(config_location=config_folder, config_type_priority=["json"])
+            self.assertEqual(parser.read_all_configuration_variables()["shared_key"], 0)
+
+            with open(os.path.join(config_folder, "config0.json"), "w") as config_file:
+                config_file.write(json.dumps({"file_key_0": "changed"}))
+            with mock.patch.object(parser, "_index_source", wraps=parser._index_source) as mock_index_source:
+                reply = parser.read_all_configuration_variables()
+                mock_index_source.assert_called_once_with(
+                    0, "json", os.path.join(config_folder, "config0.json"),
+                    parser.config_files_dict["json"].index("config0.json"), {"file_key_0": "changed"})
+            self.assertEqual(reply["shared_key"], 1)
+            self.assertEqual(reply["file_key_0"], "changed")
+            self.assertEqual(parser.cache_misses, 6)
+
+            os.remove(os.path.join(config_folder, "config1.json"))
+            reply = parser.reload()
+            self.assertListEqual(reply["changed_keys"], ["file_key_1", "shared_key"])
+            self.assertEqual(parser.read_configuration_variable("shared_key"), 2)
+            self.assertEqual(len(parser.config_key_sources["shared_key"]), 3)
+
+    def test_parser_read_all_configuration_variables_keeps_priority_order(self):
+        config_type_priority = ["cli_args", "env_vars", "json", "yaml", "env"]
+        parser = ParseIt(config_location=test_files_location, config_type_priority=config_type_priority)
+        for _ in range(2):
+            self.assertEqual(parser.read_all_configuration_variables()["file_type"], "json")
+        self.assertListEqual(parser.config_type_priority, ["cli_args", "env_vars", "json", "yaml", "env"])
+        self.assertEqual(parser.read_configuration_variable("file_type"), "json")
+
+    def test_parser_compiled_cache(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            compiled_cache_location = os.path.join(config_folder, "parse_it.cache")
+            os.mkdir(os.path.join(config_folder, "config"))
+            config_location = os.path.join(config_folder, "config")
+            with open(os.path.join(config_location, "config.json"), "w") as config_file:
+                config_file.write('{"json_key": 1, "shared_key": "json"}')
+            with open(os.path.join(config_location, "config.yaml"), "w") as config_file:
+                config_file.write('yaml_key: [1, 2]\nshared_key: yaml\n')
+            with open(os.path.join(config_location, "dates.yaml"), "w") as config_file:
+                config_file.write('date_key: 2020-01-01\n')
+            parser = ParseIt(config_location=config_location, config_type_priority=["json", "yaml"],
+                             compiled_cache_location=compiled_cache_location)
+            reply = parser.read_all_configuration_variables()
+            self.assertEqual(parser.cache_misses, 3)
+            self.assertTrue(os.path.exists(compiled_cache_location))
+
+            with mock.patch("parse_it.parser.file_types_in_folder") as mock_file_types_in_folder:
+                parser = ParseIt(config_location=config_location, config_type_priority=["json", "yaml"],
+                                 compiled_cache_location=compiled_cache_location)
+                mock_file_types_in_folder.assert_not_called()
+            self.assertDictEqual(parser.read_all_configuration_variables(), reply)
+            # the yaml date can't be compiled so it's the only file parsed again
+            self.assertEqual(parser.cache_misses, 1)
+
+            config_file_stat = os.stat(os.path.join(config_location, "config.json"))
+            os.utime(os.path.join(config_location, "config.json"),
+                     ns=(config_file_stat.st_atime_ns, config_file_stat.st_mtime_ns + 10 ** 9))
+            with open(os.path.join(config_location, "config.yaml"), "w") as config_file:
+                config_file.write('yaml_key: [1, 2, 3]\nshared_key: yaml\n')
+            parser = ParseIt(config_location=config_location, config_type_priority=["json", "yaml"],
+                             compiled_cache_location=compiled_cache_location)
+            self.assertListEqual(parser.read_configuration_variable("yaml_key"), [1, 2, 3])
+            self.assertEqual(parser.read_configuration_variable("json_key"), 1)
+            self.assertEqual(parser.cache_misses, 2)
+
+            parser = ParseIt(config_location=config_location, config_type_priority=["yaml"],
+                             compiled_cache_location=compiled_cache_location)
+            self.assertEqual(parser.read_configuration_variable("shared_key"), "yaml")
+            self.assertEqual(parser.cache_misses, 2)
+
+    def test_compiled_cache_read_write(self):
+        with tempfile.TemporaryDirectory() as compiled_cache_folder:
+            compiled_cache_location = os.path.join(compiled_cache_folder, "parse_it.cache")
+            self.assertIsNone(read_compiled_cache(compiled_cache_location))
+            write_compiled_cache(compiled_cache_location, {"test_key": [1, 2.5, None, True, "test"]})
+            self.assertDictEqual(read_compiled_cache(compiled_cache_location),
+                                 {"test_key": [1, 2.5, None, True, "test"]})
+            self.assertListEqual(os.listdir(compiled_cache_folder), ["parse_it.cache"])
+            with open(compiled_cache_location, "r+b") as compiled_cache_file:
+                compiled_cache_file.write(b"NOTPARSEIT")
+            self.assertIsNone(read_compiled_cache(compiled_cache_location))
+        self.assertFalse(can_be_compiled({"test_key": datetime.date(2020, 1, 1)}))
+        self.assertTrue(can_be_compiled({"test_key": {"nested_key": (1, 2)}}))
+
+    def test_file_reader_read_file_bytes(self):
+        with read_file_bytes(test_files_location + "/test.json") as reply:
+            self.assertIsInstance(reply, bytes)
+            self.assertEqual(reply.decode(), read_file(test_files_location + "/test.json"))
+        with mock.patch("parse_it.file.file_reader.MMAP_THRESHOLD", 16):
+            with read_file_bytes(test_files_location + "/test.json") as reply:
+                self.assertIsInstance(reply, mmap.mmap)
+                self.assertEqual(reply[:].decode(), read_file(test_files_location + "/test.json"))
+        with read_file_bytes(test_files_location + "/non_existing_file.json") as reply:
+            self.assertIsNone(reply)
+
+    def test_file_json_not_memory_mapped_without_orjson(self):
+        json_reply = parse_json_file(test_files_location + "/test.json")
+        with mock.patch("parse_it.file.file_reader.MMAP_THRESHOLD", 16), \
+                mock.patch("parse_it.file.json.orjson", None), \
+                mock.patch("parse_it.file.json.read_file_bytes", wraps=read_file_bytes) as mock_read_file_bytes:
+            self.assertDictEqual(parse_json_file(test_files_location + "/test.json"), json_reply)
+            mock_read_file_bytes.assert_called_once_with(test_files_location + "/test.json", use_mmap=False)
+            mock_read_file_bytes.reset_mock()
+            self.assertDictEqual(parse_json_file(test_files_location + "/test.json", keys=frozenset({"test_int"})),
+                                 {"test_int": 123})
+            mock_read_file_bytes.assert_called_once_with(test_files_location + "/test.json", use_mmap=True)
+            with read_file_bytes(test_files_location + "/test.json", use_mmap=False) as reply:
+                self.assertIsInstance(reply, bytes)
+
+    def test_file_json_and_xml_parsed_from_mmap(self):
+        json_reply = parse_json_file(test_files_location + "/test.json")
+        xml_reply = parse_xml_file(test_files_location + "/test.xml")
+        with mock.patch("parse_it.file.file_reader.MMAP_THRESHOLD", 16):
+            self.assertDictEqual(parse_json_file(test_files_location + "/test.json"), json_reply)
+            self.assertDictEqual(parse_xml_file(test_files_location + "/test.xml"), xml_reply)
+            with tempfile.TemporaryDirectory() as config_folder:
+                # NaN isn't valid json for orjson so it's parsed by the builtin json module
+                with open(os.path.join(config_folder, "nan.json"), "w") as config_file:
+                    config_file.write('{"test_nan": NaN, "test_padding": "' + "x" * 32 + '"}')
+                reply = parse_json_file(os.path.join(config_folder, "nan.json"))
+                self.assertNotEqual(reply["test_nan"], reply["test_nan"])
+
+    def test_xml_plain_dicts(self):
+        reply = parse_xml_file(test_files_location + "/test.xml")
+        self.assertIs(type(reply), dict)
+        self.assertIs(type(reply["xml_root"]), dict)
+        self.assertIs(type(reply["xml_root"]["test_xml"]), dict)
+        with mock.patch("json.loads") as mock_json_loads:
+            parse_xml_file(test_files_location + "/test.xml")
+            mock_json_loads.assert_not_called()
+
+    def test_xml_keys_projection(self):
+        reply = parse_xml_file(test_files_location + "/test.xml", keys={"xml_root", "other_key"})
+        self.assertDictEqual(reply, parse_xml_file(test_files_location + "/test.xml"))
+        with mock.patch("xmltodict.parse") as mock_xmltodict_parse:
+            reply = parse_xml_file(test_files_location + "/test.xml", keys={"other_key"})
+            mock_xmltodict_parse.assert_not_called()
+        self.assertDictEqual(reply, {})
+        with open(test_files_location + "/test.xml", "rb") as xml_file:
+            self.assertEqual(read_xml_root_element(xml_file.read()), "xml_root")
+        self.assertIsNone(read_xml_root_element(b"not xml"))
+        self.assertEqual(read_xml_root_element(b"<ns:root xmlns:ns='http://example.com'><unclosed>"), "ns:root")
+
+    def test_config_path_flatten_dict(self):
+        reply = flatten_dict({"a": {"b": {"c": 1}, "d": [1, 2]}, "a.d": "literal", "e": 2})
+        self.assertDictEqual(reply, {
+            "a": {"b": {"c": 1}, "d": [1, 2]},
+            "a.b": {"c": 1},
+            "a.b.c": 1,
+            "a.d": "literal",
+            "e": 2
+        })
+        self.assertIs(reply["a.b"], reply["a"]["b"])
+        self.assertDictEqual(flatten_dict({"a": {1: "b"}}, divider="/"), {"a": {1: "b"}, "a/1": "b"})
+
+    def test_parser_config_key_divider_path_lookup(self):
+        parser = ParseIt(config_location=test_files_location, config_key_divider=".")
+        self.assertEqual(parser.read_configuration_variable("test_yaml.test_yaml_key"), "test_yaml_value")
+        self.assertEqual(parser.read_configuration_variable("test_json.test_json_key"), "test_json_value")
+        self.assertTupleEqual(parser.read_configuration_variable_source("test_json.test_json_key"),
+                              ("json", test_files_location + "/test.json"))
+        self.assertEqual(parser.read_configuration_variable("test_yaml.missing_key", default_value="default"),
+                         "default")
+        self.assertDictEqual(parser.read_configuration_variable("test_yaml"), {"test_yaml_key": "test_yaml_value"})
+        # the paths are only used for lookups so reading all the keys returns the same dict as without them
+        self.assertDictEqual(parser.read_all_configuration_variables(),
+                             ParseIt(config_location=test_files_location).read_all_configuration_variables())
+
+    def test_parser_config_key_divider_cli_args_and_envvars(self):
+        os.environ["TEST_YAML_TEST_YAML_KEY"] = "envvar_value"
+        parser = ParseIt(config_location=test_files_location, config_key_divider=".", envvar_divider="_")
+        self.assertEqual(parser.read_configuration_variable("test_yaml.test_yaml_key"), "envvar_value")
+        self.assertTupleEqual(parser.read_configuration_variable_source("test_yaml.test_yaml_key"), ("env_vars", None))
+        del os.environ["TEST_YAML_TEST_YAML_KEY"]
+        with mock.patch('sys.argv', ["parse_it_mock_script.py", "--test_yaml.test_yaml_key", "cli_value"]):
+            parser = ParseIt(config_location=test_files_location, config_key_divider=".")
+            self.assertEqual(parser.read_configuration_variable("test_yaml.test_yaml_key"), "cli_value")
+
+    def test_parser_config_key_divider_reload(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            with open(os.path.join(config_folder, "test.json"), "w") as config_file:
+                json.dump({"database": {"pool": {"size": 5}}}, config_file)
+            parser = ParseIt(config_location=config_folder, config_key_divider="/")
+            self.assertEqual(parser.read_configuration_variable("database/pool/size"), 5)
+            with open(os.path.join(config_folder, "test.json"), "w") as config_file:
+                json.dump({"database": {"pool": {"size": 10, "timeout": 30}}}, config_file)
+            reply = parser.reload()
+            self.assertIn("database/pool/size", reply["changed_keys"])
+            self.assertIn("database/pool/timeout", reply["changed_keys"])
+            self.assertEqual(parser.read_configuration_variable("database/pool/size"), 10)
+
+    def test_file_json_keys_projection(self):
+        json_contents = rb'{"a": {"b": [1, "]}\\\"", {}]}, "c": "x", "d": [[], {"e": null}], "a2": true, "c": 2}'
+        self.assertDictEqual(parse_json_keys(json_contents, frozenset({"a", "c", "d", "missing"})),
+                             {"a": {"b": [1, ']}\\"', {}]}, "c": 2, "d": [[], {"e": None}]})
+        self.assertListEqual(parse_json_keys(b'[1, 2]', frozenset({"a"})), [1, 2])
+        with self.assertRaises(ValueError):
+            parse_json_keys(b'{"a": [1, 2', frozenset({"a"}))
+        reply = parse_json_file(test_files_location + "/test.json", keys=frozenset({"test_json", "test_int"}))
+        self.assertDictEqual(reply, {"test_json": {"test_json_key": "test_json_value"}, "test_int": 123})
+        with mock.patch("parse_it.file.file_reader.MMAP_THRESHOLD", 16):
+            self.assertDictEqual(parse_json_file(test_files_location + "/test.json",
+                                                 keys=frozenset({"test_json", "test_int"})), reply)
+
+    def test_file_json_keys_projection_malformed(self):
+        for json_contents in [b'{"a": 1,, "b": 2 "c": 3}', b'{"a" 1}', b'{"a": 1,}', b'{,"a": 1}', b'{"a": 1} x',
+                              b'{"a": tru}', b'{"a": 1x}', b'{"a":}', b'{"a": 1}}']:
+            with self.assertRaises(ValueError):
+                json.loads(json_contents)
+            with self.assertRaises(ValueError):
+                parse_json_keys(json_contents, frozenset({"a", "b", "c"}))
+        self.assertDictEqual(parse_json_keys(b' { } ', frozenset({"a"})), {})
+        self.assertDictEqual(parse_json_keys(b'{"a": -1.5e3, "b": NaN}\n', frozenset({"a"})), {"a": -1500.0})
+
+    def test_file_types_load_file_parser_keys(self):
+        self.assertIs(load_file_parser("json"), parse_json_file)
+        reply = load_file_parser("yaml", frozenset({"test_yaml", "missing"}))(test_files_location + "/test.yaml")
+        self.assertDictEqual(reply, {"test_yaml": {"test_yaml_key": "test_yaml_value"}})
+        reply = load_file_parser("xml", frozenset({"other_key"}))(test_files_location + "/test.xml")
+        self.assertDictEqual(reply, {})
+
+    def test_parser_declared_keys(self):
+        os.environ["TEST_DECLARED_ENVVAR"] = "1"
+        os.environ["TEST_UNDECLARED_ENVVAR"] = "2"
+        test_args = ["parse_it_mock_script.py", "--test_declared_cli", "3", "--test_undeclared_cli", "4"]
+        with mock.patch('sys.argv', test_args):
+            parser = ParseIt(config_location=test_files_location, declared_keys=[
+                "test_declared_envvar", "test_declared_cli", "test_json", "test_yaml.test_yaml_key", "test_int"
+            ], config_key_divider=".")
+            reply = parser.read_all_configuration_variables()
+        del os.environ["TEST_DECLARED_ENVVAR"]
+        del os.environ["TEST_UNDECLARED_ENVVAR"]
+        self.assertDictEqual(reply, {
+            "test_declared_envvar": 1,
+            "test_declared_cli": 3,
+            "test_json": {"test_json_key": "test_json_value"},
+            "test_yaml": {"test_yaml_key": "test_yaml_value"},
+            "test_int": 123
+        })
+        self.assertEqual(parser.read_configuration_variable("test_yaml.test_yaml_key"), "test_yaml_value")
+        self.assertIsNone(parser.read_configuration_variable("test_string"))
+        self.assertIsNone(parser.read_configuration_variable("test_undeclared_envvar"))
+        for _, file_dict in parser.parsed_files_cache.values():
+            self.assertTrue(set(file_dict) <= {"test_json", "test_yaml", "test_int"})
+
+    def test_config_path_read_config_path(self):
+        self.assertTupleEqual(read_config_path({"a": {"b": {"c": None}}}, "a.b.c"), (True, None))
+        self.assertTupleEqual(read_config_path({"a": {"b": 1}}, "a/b", divider="/"), (True, 1))
+        self.assertTupleEqual(read_config_path({"a": {"b": 1}}, "a.b.c"), (False, None))
+        self.assertTupleEqual(read_config_path({"a": {"b": 1}}, "a.c"), (False, None))
+
+    def test_parser_read_multiple_configuration_variables_per_key_options(self):
+        parser = ParseIt(config_location=test_files_location)
+        reply = parser.read_multiple_configuration_variables({
+            "test_string": None,
+            "test_int": {"allowed_types": [int]},
+            "test_missing_key": {"default_value": "test_default"},
+            "test_other_missing_key": {}
+        }, default_value="call_default", allowed_types=[str, int])
+        self.assertDictEqual(reply, {
+            "test_string": "testing",
+            "test_int": 123,
+            "test_missing_key": "test_default",
+            "test_other_missing_key": "call_default"
+        })
+        with self.assertRaises(ValueError):
+            parser.read_multiple_configuration_variables({"test_missing_key": {"required": True}})
+        with self.assertRaises(TypeError):
+            parser.read_multiple_configuration_variables({"test_string": {"allowed_types": [int]}})
+        with self.assertRaises(ValueError):
+            parser.read_multiple_configuration_variables({"test_string": {"default": "typo"}})
+
+    def test_parser_read_multiple_configuration_variables_early_stop(self):
+        config_names = ["file_type", "test_string", "test_json"]
+        parser = ParseIt(config_location=test_files_location)
+        reply = parser.read_multiple_configuration_variables(config_names)
+        self.assertIsNone(parser.config_index)
+        index_parser = ParseIt(config_location=test_files_location)
+        expected_reply = {config_name: index_parser.read_configuration_variable(config_name)
+                          for config_name in config_names}
+        self.assertDictEqual(reply, {"file_type": "env", "test_string": "testing",
+                                     "test_json": {"test_json_key": "test_json_value"}})
+        self.assertDictEqual(reply, expected_reply)
+        # the walk stopped once the json file was parsed so none of the lower priority files were parsed
+        self.assertSetEqual(set(parser.parsed_files_cache), {os.path.abspath(test_files_location + "/test.env"),
+                                                             os.path.abspath(test_files_location + "/test.json")})
+        parser.rebuild_index()
+        self.assertDictEqual(parser.read_multiple_configuration_variables(config_names), reply)
+
+        parser = ParseIt(config_location=test_files_location)
+        with mock.patch.dict(os.environ, {"TEST_JSON": "envvar_value"}):
+            reply = parser.read_multiple_configuration_variables(["test_json"])
+        self.assertDictEqual(reply, {"test_json": "envvar_value"})
+        self.assertEqual(parser.cache_misses, 0)
+
+    def test_parser_read_all_configuration_variables_early_exit(self):
+        parser = ParseIt(config_location=test_files_location)
+        reply = parser.read_all_configuration_variables(default_value={"test_missing_key": "test_default"},
+                                                        required=["test_json"], allowed_types={"test_int": [int]},
+                                                        early_exit=True)
+        self.assertDictEqual(reply, {"test_missing_key": "test_default",
+                                     "test_json": {"test_json_key": "test_json_value"}, "test_int": 123})
+        self.assertIsNone(parser.config_index)
+        # the json file is the highest priority file with test_json & test_missing_key isn't in any of the files
+        self.assertNotIn(test_files_location + "/test.xml", parser.skipped_config_files)
+        parser = ParseIt(config_location=test_files_location)
+        reply = parser.read_all_configuration_variables(required=["test_json", "test_int"], early_exit=True)
+        self.assertDictEqual(reply, {"test_json": {"test_json_key": "test_json_value"}, "test_int": 123})
+        self.assertListEqual(sorted(parser.parsed_files_cache), [
+            os.path.abspath(test_files_location + "/test.env"), os.path.abspath(test_files_location + "/test.json")
+        ])
+        self.assertIn(test_files_location + "/test.xml", parser.skipped_config_files)
+        self.assertIn(test_files_location + "/test.yaml", parser.skipped_config_files)
+        self.assertNotIn(test_files_location + "/test.json", parser.skipped_config_files)
+        parser.read_all_configuration_variables()
+        self.assertListEqual(parser.skipped_config_files, [])
+
+    def test_parser_read_all_configuration_variables_early_exit_declared_keys(self):
+        parser = ParseIt(config_location=test_files_location, declared_keys=["test_yaml", "test_float"])
+        reply = parser.read_all_configuration_variables(early_exit=True)
+        self.assertDictEqual(reply, {"test_yaml": {"test_yaml_key": "test_yaml_value"}, "test_float": 123.123})
+        with self.assertRaises(ValueError):
+            ParseIt(config_location=test_files_location).read_all_configuration_variables(early_exit=True)
+
+    def test_async_parser_read_all_configuration_variables_early_exit(self):
+        from parse_it import AsyncParseIt
+        parser = AsyncParseIt(config_location=test_files_location)
+        reply = asyncio.run(parser.read_all_configuration_variables(required=["test_json"], early_exit=True))
+        self.assertDictEqual(reply, {"test_json": {"test_json_key": "test_json_value"}})
+        self.assertIn(test_files_location + "/test.xml", parser.skipped_config_files)
+
+    def test_snapshot_config_snapshot_immutable(self):
+        config_snapshot = ConfigSnapshot({"a": {"b": [1, {"c": 2}]}, "d": {3}, "e": "test"})
+        self.assertIsInstance(config_snapshot["a"], ConfigSnapshot)
+        self.assertTupleEqual(config_snapshot["a"]["b"], (1, ConfigSnapshot({"c": 2})))
+        self.assertIsInstance(config_snapshot["d"], frozenset)
+        self.assertEqual(config_snapshot, {"a": {"b": (1, {"c": 2})}, "d": frozenset({3}), "e": "test"})
+        self.assertDictEqual(config_snapshot.to_dict(), {"a": {"b": [1, {"c": 2}]}, "d": {3}, "e": "test"})
+        with self.assertRaises(TypeError):
+            config_snapshot["e"] = "changed"
+        with self.assertRaises(AttributeError):
+            config_snapshot._config_dict = {}
+        with self.assertRaises(AttributeError):
+            config_snapshot.update({"e": "changed"})
+
+    def test_snapshot_freeze_config_structural_sharing(self):
+        config_snapshot = freeze_config({"a": {"b": [1, 2]}, "c": {"d": 1}, "e": 1})
+        self.assertIs(freeze_config({"a": {"b": [1, 2]}, "c": {"d": 1}, "e": 1}, config_snapshot), config_snapshot)
+        new_config_snapshot = freeze_config({"a": {"b": [1, 2]}, "c": {"d": 2}, "e": True}, config_snapshot)
+        self.assertIs(new_config_snapshot["a"], config_snapshot["a"])
+        self.assertIsNot(new_config_snapshot["c"], config_snapshot["c"])
+        self.assertIs(new_config_snapshot["e"], True)
+        self.assertEqual(config_snapshot["c"]["d"], 1)
+
+    def test_parser_snapshot_published_on_reload(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            with open(os.path.join(config_folder, "test.json"), "w") as config_file:
+                json.dump({"test_nested": {"test_key": [1, 2]}, "test_changed": "a"}, config_file)
+            parser = ParseIt(config_location=config_folder, config_type_priority=["json"])
+            config_snapshot = parser.snapshot()
+            self.assertIs(parser.snapshot(), config_snapshot)
+            self.assertDictEqual(config_snapshot.to_dict(), parser.read_all_configuration_variables())
+            with open(os.path.join(config_folder, "test.json"), "w") as config_file:
+                json.dump({"test_nested": {"test_key": [1, 2]}, "test_changed": "changed"}, config_file)
+            parser.reload()
+            new_config_snapshot = parser.snapshot()
+            self.assertEqual(new_config_snapshot["test_changed"], "changed")
+            self.assertEqual(config_snapshot["test_changed"], "a")
+            self.assertIs(new_config_snapshot["test_nested"], config_snapshot["test_nested"])
+
+    def test_parser_concurrent_readers_and_reloads(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            with open(os.path.join(config_folder, "test.json"), "w") as config_file:
+                json.dump({"test_key": 0, "test_other_key": 0}, config_file)
+            parser = ParseIt(config_location=config_folder, config_type_priority=["json"])
+            parser.snapshot()
+            reader_errors = []
+
+            def read_config():
+                try:
+                    for _ in range(200):
+                        config_snapshot = parser.snapshot()
+                        # both keys are written together so a snapshot always has the same value in both
+                        self.assertEqual(config_snapshot["test_key"], config_snapshot["test_other_key"])
+                        self.assertIsInstance(parser.read_configuration_variable("test_key"), int)
+                        self.assertIn("test_key", parser.read_all_configuration_variables())
+                except Exception as e:
+                    reader_errors.append(e)
+
+            reader_threads = [threading.Thread(target=read_config) for _ in range(4)]
+            for reader_thread in reader_threads:
+                reader_thread.start()
+            for config_version in range(1, 30):
+                # the file is replaced as a whole so the readers never parse a partially written file
+                with open(os.path.join(config_folder, "test.json.tmp"), "w") as config_file:
+                    json.dump({"test_key": config_version, "test_other_key": config_version,
+                               "test_padding": "x" * config_version}, config_file)
+                os.replace(os.path.join(config_folder, "test.json.tmp"), os.path.join(config_folder, "test.json"))
+                parser.reload()
+            for reader_thread in reader_threads:
+                reader_thread.join()
+            self.assertListEqual(reader_errors, [])
+
+    def test_parser_recurse_absolute_location_file_order(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            os.mkdir(os.path.join(config_folder, "sub"))
+            with open(os.path.join(config_folder, "a.json"), "w") as config_file:
+                json.dump({"k": "top"}, config_file)
+            with open(os.path.join(config_folder, "sub", "b.json"), "w") as config_file:
+                json.dump({"k": "sub"}, config_file)
+            parser = ParseIt(config_location=os.path.abspath(config_folder), recurse=True,
+                             config_type_priority=["json"])
+            expected_reply = "top" if parser.config_files_dict["json"][0].endswith("a.json") else "sub"
+            self.assertEqual(parser.read_configuration_variable("k"), expected_reply)
+            self.assertDictEqual(parser.read_all_configuration_variables(), {"k": expected_reply})
+            self.assertDictEqual(ParseIt(config_location=os.path.abspath(config_folder), recurse=True,
+                                         config_type_priority=["json"]).read_multiple_configuration_variables(["k"]),
+                                 {"k": expected_reply})
+            # a file added before the others in the list moves them so their order is merged again
+            with open(os.path.join(config_folder, "sub", "a.json"), "w") as config_file:
+                json.dump({"k": "new"}, config_file)
+            parser.reload()
+            expected_reply = ParseIt(config_location=os.path.abspath(config_folder), recurse=True,
+                                     config_type_priority=["json"]).read_multiple_configuration_variables(["k"])
+            self.assertDictEqual(parser.read_all_configuration_variables(), expected_reply)
+
+    def test_parser_reload_single_file_removed(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            config_file_location = os.path.join(config_folder, "test.json")
+            with open(config_file_location, "w") as config_file:
+                json.dump({"test_key": "test_value"}, config_file)
+            parser = ParseIt(config_location=config_file_location, config_type_priority=["json"])
+            self.assertEqual(parser.read_configuration_variable("test_key"), "test_value")
+            os.remove(config_file_location)
+            reply = parser.reload()
+            self.assertDictEqual(reply, {"added_files": [], "removed_files": [config_file_location],
+                                         "modified_files": [], "changed_keys": ["test_key"]})
+            self.assertIsNone(parser.read_configuration_variable("test_key"))
+            self.assertDictEqual(parser.read_all_configuration_variables(), {})
+            self.assertListEqual(parser.reload()["removed_files"], [])
+            with open(config_file_location, "w") as config_file:
+                json.dump({"test_key": "new_value"}, config_file)
+            reply = parser.reload()
+            self.assertListEqual(reply["added_files"], [config_file_location])
+            self.assertListEqual(reply["changed_keys"], ["test_key"])
+            self.assertEqual(parser.read_configuration_variable("test_key"), "new_value")
+
+    def test_parser_envvars_snapshot_shared_by_all_reads(self):
+        with mock.patch.dict(os.environ, {"TEST_SHARED_SNAPSHOT": "old"}):
+            parser = ParseIt(config_location=test_files_location, config_type_priority=["envvars", "json"])
+            self.assertEqual(parser.read_configuration_variable("TEST_SHARED_SNAPSHOT"), "old")
+            os.environ["TEST_SHARED_SNAPSHOT"] = "new"
+            self.assertEqual(parser.read_configuration_variable("TEST_SHARED_SNAPSHOT"), "old")
+            self.assertEqual(parser.read_multiple_configuration_variables(["TEST_SHARED_SNAPSHOT"]),
+                             {"TEST_SHARED_SNAPSHOT": "old"})
+            self.assertEqual(parser.read_all_configuration_variables()["test_shared_snapshot"], "old")
+            parser.refresh_envvars()
+            self.assertEqual(parser.read_configuration_variable("TEST_SHARED_SNAPSHOT"), "new")
+            self.assertEqual(parser.read_multiple_configuration_variables(["TEST_SHARED_SNAPSHOT"]),
+                             {"TEST_SHARED_SNAPSHOT": "new"})
+            self.assertEqual(parser.read_all_configuration_variables()["test_shared_snapshot"], "new")
+
+    def test_parser_repeated_cli_args_returned_lists_are_copies(self):
+        test_args = ["parse_it_mock_script.py", "--test_repeated", "1", "--test_repeated", "2"]
+        with mock.patch('sys.argv', test_args):
+            parser = ParseIt(config_location=test_files_location, type_estimate=False)
+            parser.read_configuration_variable("test_repeated").append("3")
+            self.assertListEqual(parser.config_index["test_repeated"][3], ["1", "2"])
+            parser.read_multiple_configuration_variables(["test_repeated"])["test_repeated"].append("3")
+            self.assertListEqual(parser.config_index["test_repeated"][3], ["1", "2"])
+            self.assertListEqual(parser.read_configuration_variable("test_repeated"), ["1", "2"])
+            self.assertListEqual(parser.read_all_configuration_variables()["test_repeated"], ["1", "2"])
+
+    def test_parser_read_all_configuration_variables_early_exit_nested_envvars(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            with open(os.path.join(config_folder, "config.json"), "w") as config_file:
+                json.dump({"db": {"host": "file", "port": 5432}, "test_other": "file"}, config_file)
+            with mock.patch.dict(os.environ, {"DB_HOST": "env"}):
+                parser = ParseIt(config_location=config_folder, config_type_priority=["envvars", "json"],
+                                 envvar_divider="_")
+                reply = parser.read_all_configuration_variables(required=["db", "test_other"], early_exit=True)
+                full_reply = parser.read_all_configuration_variables()
+        self.assertDictEqual(reply, {"db": {"host": "env"}, "test_other": "file"})
+        self.assertDictEqual(reply, {"db": full_reply["db"], "test_other": full_reply["test_other"]})
+
+    def test_parser_compiled_cache_unchanged_files_not_hashed_again(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            compiled_cache_location = os.path.join(config_folder, "parse_it.cache")
+            config_location = os.path.join(config_folder, "config")
+            os.mkdir(config_location)
+            for config_file_name in ("first.json", "second.json"):
+                with open(os.path.join(config_location, config_file_name), "w") as config_file:
+                    json.dump({config_file_name: 1}, config_file)
+            parser = ParseIt(config_location=config_location, config_type_priority=["json"],
+                             compiled_cache_location=compiled_cache_location)
+            parser.read_all_configuration_variables()
+            with open(os.path.join(config_location, "second.json"), "w") as config_file:
+                json.dump({"second.json": 22}, config_file)
+            with mock.patch("parse_it.parser.file_sha256", wraps=file_sha256) as mock_file_sha256, \
+                    mock.patch("parse_it.parser.can_be_compiled", wraps=can_be_compiled) as mock_can_be_compiled:
+                self.assertEqual(parser.read_configuration_variable("second.json"), 22)
+            mock_file_sha256.assert_called_once_with(os.path.join(config_location, "second.json"))
+            self.assertEqual(mock_can_be_compiled.call_count, 1)
+
+            parser = ParseIt(config_location=config_location, config_type_priority=["json"],
+                             compiled_cache_location=compiled_cache_location)
+            self.assertDictEqual(parser.read_all_configuration_variables(), {"first.json": 1, "second.json": 22})
+            self.assertEqual(parser.cache_misses, 0)
+
+    def test_parser_compiled_cache_suffix_mapping_changed(self):
+        with tempfile.TemporaryDirectory() as config_folder:
+            compiled_cache_location = os.path.join(config_folder, "parse_it.cache")
+            config_location = os.path.join(config_folder, "config")
+            os.mkdir(config_location)
+            with open(os.path.join(config_location, "config.custom"), "w") as config_file:
+                config_file.write('{"custom_key": "value"}')
+            parser = ParseIt(config_location=config_location, config_type_priority=["custom"],
+                             custom_suffix_mapping={"json": ["custom"]},
+                             compiled_cache_location=compiled_cache_location)
+            self.assertEqual(parser.read_configuration_variable("custom_key"), "value")
+            with mock.patch("parse_it.parser.file_types_in_folder", wraps=file_types_in_folder) as \
+                    mock_file_types_in_folder:
+                parser = ParseIt(config_location=config_location, config_type_priority=["custom"],
+                                 custom_suffix_mapping={"yaml": ["custom"]},
+                                 compiled_cache_location=compiled_cache_location)
+                mock_file_types_in_folder.assert_called_once()
+            self.assertEqual(parser.read_configuration_variable("custom_key"), "value")
+            self.assertEqual(parser.cache_misses, 1)
+
+    def test_parser_declared_keys_xml_root_projection(self):
+        parser = ParseIt(config_location=test_files_location + "/test.xml", declared_keys=["test_xml"])
+        with mock.patch("xmltodict.parse") as mock_xmltodict_parse:
+            self.assertIsNone(parser.read_configuration_variable("test_xml"))
+            mock_xmltodict_parse.assert_not_called()
+        parser = ParseIt(config_location=test_files_location + "/test.xml", declared_keys=["xml_root"])
+        self.assertEqual(parser.read_configuration_variable("xml_root")["test_xml"]["test_xml_key"], "test_xml_value")
+
+    def test_async_parser_index_lock_not_taken_on_event_loop(self):
+        from parse_it import AsyncParseIt
+        locking_threads = set()
+
+        class ThreadRecordingLock:
+            def __init__(self):
+                self.lock = threading.RLock()
+
+            def __enter__(self):
+                locking_threads.add(threading.get_ident())
+                return self.lock.__enter__()
+
+            def __exit__(self, *args):
+                return self.lock.__exit__(*args)
+
+        async def read_configuration():
+            parser = AsyncParseIt(config_location=test_files_location)
+            parser._index_lock = ThreadRecordingLock()
+            return (await parser.read_configuration_variable("test_int"),
+                    await parser.read_multiple_configuration_variables(["test_int"]),
+                    await parser.read_configuration_variable_source("test_json"),
+                    await parser.read_configuration_variable("test_int"))
+
+        reply = asyncio.run(read_configuration())
+        self.assertTupleEqual(reply, (123, {"test_int": 123}, ("json", test_files_location + "/test.json"), 123))
+        self.assertTrue(locking_threads)
+        self.assertNotIn(threading.get_ident(), locking_threads)
+
+    def test_parser_compiled_cache_written_when_files_parsed_ahead(self):
+        from parse_it import AsyncParseIt
+        with tempfile.TemporaryDirectory() as config_folder:
+            config_location = os.path.join(config_folder, "config")
+            os.mkdir(config_location)
+            for config_file_number in range(4):
+                with open(os.path.join(config_location, "config" + str(config_file_number) + ".json"), "w") as \
+                        config_file:
+                    json.dump({"key" + str(config_file_number): config_file_number}, config_file)
+
+            compiled_cache_location = os.path.join(config_folder, "threads.cache")
+            with mock.patch("parse_it.parser.PARALLEL_PARSING_MIN_BYTES", 0):
+                parser = ParseIt(config_location=config_location, config_type_priority=["json"],
+                                 parallel_parsing="threads", compiled_cache_location=compiled_cache_location)
+                self.assertEqual(parser.read_configuration_variable("key3"), 3)
+            self.assertEqual(len(read_compiled_cache(compiled_cache_location)["files"]), 4)
+
+            compiled_cache_location = os.path.join(config_folder, "async.cache")
+            parser = AsyncParseIt(config_location=config_location, config_type_priority=["json"],
+                                  compiled_cache_location=compiled_cache_location)
+            self.assertEqual(asyncio.run(parser.read_configuration_variable("key3")), 3)
+            self.assertEqual(len(read_compiled_cache(compiled_cache_location)["files"]), 4)
+            parser = AsyncParseIt(config_location=config_location, config_type_priority=["json"],
+                                  compiled_cache_location=compiled_cache_location)
+            self.assertDictEqual(asyncio.run(parser.read_all_configuration_variables()),
+                                 {"key0": 0, "key1": 1, "key2": 2, "key3": 3})
+            self.assertEqual(parser.cache_misses, 0)
+
+    def test_parser_repeated_cli_args_type_estimated(self):
+        test_args = ["parse_it_mock_script.py", "--test_repeated_port", "1", "--test_repeated_port", "2",
+                     "--test_repeated_port=true", "--test_single_port", "1"]
+        with mock.patch('sys.argv', test_args), mock.patch.dict(os.environ, {"TEST_ENVVAR_PORTS": "[1, 2]"}):
+            parser = ParseIt(config_location=test_files_location)
+            self.assertListEqual(parser.read_configuration_variable("test_repeated_port"), [1, 2, True])
+            self.assertEqual(parser.read_configuration_variable("test_single_port"), 1)
+            self.assertListEqual(parser.read_configuration_variable("test_envvar_ports"), [1, 2])
+            self.assertListEqual(parser.read_all_configuration_variables()["test_repeated_port"], [1, 2, True])
+        self.assertListEqual(estimate_type(["1", ["2.5", "none"], {"key": "false"}]), [1, [2.5, None], {"key": False}])
+
+    def test_parser_lookup_checks_each_file_once(self):
+        from parse_it import AsyncParseIt
+        with tempfile.TemporaryDirectory() as config_folder:
+            for config_file_number in range(4):
+                with open(os.path.join(config_folder, "config" + str(config_file_number) + ".json"), "w") as \
+                        config_file:
+                    json.dump({"key" + str(config_file_number): config_file_number}, config_file)
+            for parser in [ParseIt(config_location=config_folder, config_type_priority=["json"]),
+                           ParseIt(config_location=config_folder, config_type_priority=["json"],
+                                   parallel_parsing="threads")]:
+                self.assertEqual(parser.read_configuration_variable("key0"), 0)
+                with mock.patch.object(ParseIt, "_config_file_fingerprint",
+                                       wraps=ParseIt._config_file_fingerprint) as mock_config_file_fingerprint:
+                    self.assertEqual(parser.read_configuration_variable("key1"), 1)
+                    self.assertEqual(mock_config_file_fingerprint.call_count, 4)
+                    self.assertTupleEqual(parser.read_configuration_variable_source("key1"),
+                                          ("json", os.path.join(config_folder, "config1.json")))
+                    self.assertEqual(mock_config_file_fingerprint.call_count, 8)
+                    self.assertDictEqual(parser.read_multiple_configuration_variables(["key2", "key3"]),
+                                         {"key2": 2, "key3": 3})
+                    self.assertEqual(mock_config_file_fingerprint.call_count, 12)
+
+            parser = AsyncParseIt(config_location=config_folder, config_type_priority=["json"])
+            self.assertEqual(asyncio.run(parser.read_configuration_variable("key0")), 0)
+            with mock.patch.object(ParseIt, "_config_file_fingerprint",
+                                   wraps=ParseIt._config_file_fingerprint) as mock_config_file_fingerprint:
+                self.assertEqual(asyncio.run(parser.read_configuration_variable("key1")), 1)
+                self.assertEqual(mock_config_file_fingerprint.call_count, 4)